@@ -11,18 +11,12 @@ class DataService:
     
     def get_data(self, key, default=None, timeout=30, retry=3, validate=True, refresh=False):
         """Get data with many parameters (high param count)."""
-        # Many nested conditions (high nesting)
-        if self.cache:
-            if key in self.cache:
-                if validate:
-                    if refresh:
-                        return self._refresh_cache(key)
-                    else:
-                        return self.cache[key]
-                else:
-                    return self.cache.get(key, default)
-        
-        return default
+        cache = self.cache
+        if key not in cache:
+            return default
+        if not validate:
+            return cache.get(key, default)
+        return self._refresh_cache(key) if refresh else cache[key]
     
     def set_data(self, key, value):
         """Set data in cache."""
@@ -4,17 +4,15 @@ class UserService:
     """Service for managing users."""
     
     def __init__(self):
-        self.users = []
+        self.users = {}
     
     def create_user(self, username, email):
         """Create a new user."""
         user = {"username": username, "email": email}
-        self.users.append(user)
+        # The first user registered under a username wins, as with a list scan
+        self.users.setdefault(username, user)
         return user
     
     def get_user(self, username):
         """Get user by username."""
-        for user in self.users:
-            if user["username"] == username:
-                return user
-        return None
+        return self.users.get(username)
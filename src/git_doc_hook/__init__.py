@@ -2,13 +2,23 @@
 
 __version__ = "0.1.0"
 
-# Import core modules for easier access
-from git_doc_hook.core.config import Config
-from git_doc_hook.core.git import GitManager
-from git_doc_hook.core.state import StateManager
-
+# Core classes are exposed for easier access. They are forwarded from
+# git_doc_hook.core, which imports them on first use, so that importing the
+# CLI does not load them up front
 __all__ = [
     "Config",
     "GitManager",
     "StateManager",
 ]
+
+
+def __getattr__(name):
+    """Import core classes on first access"""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from git_doc_hook import core
+
+    value = getattr(core, name)
+    globals()[name] = value
+    return value
@@ -3,7 +3,19 @@
 Provides language-specific analysis for complexity detection
 and change categorization.
 """
-from git_doc_hook.analyzers.base import BaseAnalyzer, ComplexityMetrics, AnalysisResult
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+from git_doc_hook.analyzers.base import (
+    BaseAnalyzer,
+    ComplexityMetrics,
+    AnalysisResult,
+    GenericAnalyzer,
+    read_shebang,
+)
 from .python import PythonAnalyzer
 from .javascript import JavaScriptAnalyzer
 from .bash import BashAnalyzer
@@ -12,12 +24,48 @@ __all__ = [
     "BaseAnalyzer",
     "ComplexityMetrics",
     "AnalysisResult",
+    "GenericAnalyzer",
     "PythonAnalyzer",
     "JavaScriptAnalyzer",
     "BashAnalyzer",
+    "get_analyzer",
+    "analyze_paths",
+    "analyze_many",
 ]
 
 
+# Analyzers are stateless, so a single shared instance of each is reused
+_ANALYZERS = (PythonAnalyzer(), JavaScriptAnalyzer(), BashAnalyzer())
+_EXT_MAP = {ext: analyzer for analyzer in _ANALYZERS for ext in analyzer.extensions}
+_FALLBACK = GenericAnalyzer()
+
+# Below this many files, analyzing serially beats the cost of starting
+# worker processes
+_PARALLEL_MIN_FILES = 32
+
+# One shebang pattern over every analyzer's interpreters, e.g.
+# "#!/usr/bin/env python3" captures b"python"
+_INTERP_MAP = {interp: analyzer for analyzer in _ANALYZERS for interp in analyzer.interpreters}
+_SHEBANG_RE = re.compile(
+    rb"^#!.*?\b("
+    + b"|".join(re.escape(interp) for interp in sorted(_INTERP_MAP, key=len, reverse=True))
+    + rb")[0-9.]*\b"
+)
+
+
+def _shebang_probe(file_path: str) -> Optional[BaseAnalyzer]:
+    """Find an analyzer for a file from its shebang line
+
+    Args:
+        file_path: Path to file to analyze
+
+    Returns:
+        Matching analyzer or None
+    """
+    match = _SHEBANG_RE.match(read_shebang(file_path))
+    return _INTERP_MAP[match.group(1)] if match else None
+
+
 def get_analyzer(file_path: str) -> BaseAnalyzer:
     """Get appropriate analyzer for a file
 
@@ -27,12 +75,87 @@ def get_analyzer(file_path: str) -> BaseAnalyzer:
     Returns:
         Appropriate analyzer instance
     """
-    # Try each analyzer to see which can handle the file
-    analyzers = [PythonAnalyzer(), JavaScriptAnalyzer(), BashAnalyzer()]
+    suffix = os.path.splitext(file_path)[1].lower()
+    return _EXT_MAP.get(suffix) or _shebang_probe(file_path) or _FALLBACK
+
+
+def _analyze_one(
+    file_path: str, context: Optional[Dict[str, Any]] = None
+) -> AnalysisResult:
+    """Analyze a single file with its analyzer (process pool worker)"""
+    return get_analyzer(file_path).analyze(file_path, context)
+
+
+def _analyze_with(
+    analyzer_cls: Type[BaseAnalyzer],
+    file_path: str,
+    context: Optional[Dict[str, Any]] = None,
+) -> AnalysisResult:
+    """Analyze a single file with a given analyzer class (process pool worker)"""
+    return analyzer_cls().analyze(file_path, context)
+
+
+def _map_paths(
+    analyze: Callable[[str], AnalysisResult],
+    paths: List[str],
+    workers: Optional[int],
+) -> Iterator[AnalysisResult]:
+    """Apply analyze to paths, in worker processes for large batches"""
+    if len(paths) >= _PARALLEL_MIN_FILES and workers != 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            executor = None
+        if executor is not None:
+            with executor:
+                yield from executor.map(analyze, paths, chunksize=16)
+            return
+
+    for file_path in paths:
+        yield analyze(file_path)
+
+
+def analyze_paths(
+    paths: Iterable[str],
+    context: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[AnalysisResult]:
+    """Analyze many files, in parallel processes for large batches
+
+    Analysis is CPU-bound Python, so batches are spread over processes
+    rather than threads. Small batches, or environments where a process
+    pool cannot be started, are analyzed serially.
+
+    Args:
+        paths: Paths of files to analyze
+        context: Analysis context shared by all files
+        workers: Maximum number of worker processes (default: CPU count)
+
+    Returns:
+        Iterator of AnalysisResult, in the order of paths
+    """
+    return _map_paths(partial(_analyze_one, context=context), list(paths), workers)
+
+
+def analyze_many(
+    analyzer_cls: Type[BaseAnalyzer],
+    paths: Iterable[str],
+    context: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+) -> List[AnalysisResult]:
+    """Analyze many files with one analyzer class
 
-    for analyzer in analyzers:
-        if analyzer.can_analyze(file_path):
-            return analyzer
+    Like analyze_paths(), but skips get_analyzer() dispatch; each worker
+    process builds its own analyzer instance.
 
-    # Return generic analyzer (base class) as fallback
-    return BaseAnalyzer()
+    Args:
+        analyzer_cls: Analyzer class to use for every file
+        paths: Paths of files to analyze
+        context: Analysis context shared by all files
+        workers: Maximum number of worker processes (default: CPU count)
+
+    Returns:
+        List of AnalysisResult, in the order of paths
+    """
+    analyze = partial(_analyze_with, analyzer_cls, context=context)
+    return list(_map_paths(analyze, list(paths), workers))
@@ -0,0 +1,157 @@
+"""Persistent cache for analysis results
+
+Stores pickled AnalysisResult objects under ~/.git-doc-hook/cache/analysis,
+keyed by a SHA-256 digest of the file's size, mtime and inode and everything
+else that influences the result, so unchanged files are not re-analyzed,
+or even read. Only
+context-free analyses are cached, and the least recently used entries are
+evicted once the cache grows past _MAX_ENTRIES.
+"""
+import functools
+import hashlib
+import heapq
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from git_doc_hook import __version__
+from git_doc_hook.analyzers.base import AnalysisResult
+
+CACHE_DIR = Path("~/.git-doc-hook/cache/analysis").expanduser()
+
+# Maximum number of cached results. Pruning goes down to three quarters of
+# this, spreading the cost of scanning the directory over many stores.
+_MAX_ENTRIES = 2048
+
+
+def make_key(*parts: Any) -> str:
+    """Build a cache key from the given parts
+
+    Args:
+        parts: Values identifying an analysis; bytes are hashed as-is,
+               everything else by its repr
+
+    Returns:
+        Hex digest usable as a file name
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = repr(part).encode("utf-8")
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def load(key: str) -> Optional[AnalysisResult]:
+    """Load a cached result
+
+    Args:
+        key: Cache key from make_key()
+
+    Returns:
+        Cached AnalysisResult or None on miss
+    """
+    path = CACHE_DIR / f"{key}.pkl"
+    try:
+        with open(path, "rb") as f:
+            result = pickle.load(f)
+        # Mark the entry as recently used for _prune()
+        os.utime(path)
+    except (
+        OSError, pickle.PickleError, EOFError,
+        AttributeError, ImportError, TypeError, ValueError,
+    ):
+        return None
+    return result if isinstance(result, AnalysisResult) else None
+
+
+def store(key: str, result: AnalysisResult) -> None:
+    """Store a result in the cache
+
+    Failures are ignored; the cache is purely an optimization.
+
+    Args:
+        key: Cache key from make_key()
+        result: Result to store
+    """
+    target = CACHE_DIR / f"{key}.pkl"
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except (OSError, pickle.PickleError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    _prune()
+
+
+def _prune() -> None:
+    """Evict the least recently used entries once there are too many"""
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            entries = [
+                (entry.stat().st_mtime_ns, entry.path)
+                for entry in it
+                if entry.name.endswith(".pkl")
+            ]
+    except OSError:
+        return
+    if len(entries) <= _MAX_ENTRIES:
+        return
+
+    for _, path in heapq.nsmallest(len(entries) - _MAX_ENTRIES * 3 // 4, entries):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def cached_analysis(analyze: Callable) -> Callable:
+    """Decorator caching an analyzer's analyze() method on disk
+
+    The key covers the analyzer, package version, file path and the file's
+    mode, size, mtime and inode; the inode catches files replaced by a rename
+    within one mtime tick. Calls with a context are not cached: it carries per-commit
+    data such as the commit message, so every commit would miss. Incremental
+    analyses (a prior result given) bypass the cache too, so they neither
+    serve nor replace a full analysis.
+    """
+
+    @functools.wraps(analyze)
+    def wrapper(self, file_path: str, context=None, **kwargs):
+        if context or kwargs.get("prior") is not None:
+            return analyze(self, file_path, context, **kwargs)
+
+        # Reuse the cached stat of an os.scandir() entry when one is given
+        entry = kwargs.get("entry")
+        try:
+            st = entry.stat() if entry is not None else os.stat(file_path)
+        except OSError:
+            return analyze(self, file_path, context, **kwargs)
+        if self.should_skip(Path(file_path), st.st_size):
+            return analyze(self, file_path, context, **kwargs)
+
+        key = make_key(
+            type(self).__qualname__,
+            self.language,
+            __version__,
+            file_path,
+            st.st_mode,
+            st.st_size,
+            st.st_mtime_ns,
+            st.st_ino,
+        )
+        result = load(key)
+        if result is None:
+            result = analyze(self, file_path, context, **kwargs)
+            store(key, result)
+        return result
+
+    return wrapper
@@ -3,13 +3,33 @@
 Defines the abstract interface that all analyzers must implement
 along with common data structures.
 """
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+# These records are created per function and per file, so use __slots__
+# where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Branching keywords counted towards cyclomatic complexity by default
+_BRANCH_KEYWORDS = (
+    "if", "elif", "else", "for", "while", "case", "switch",
+    "catch", "try", "except", "finally", "and", "or",
+)
+
+
+def _compile_keywords(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile a whole-word alternation over a fixed keyword set"""
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b")
+
+
+@dataclass(**_SLOTS)
 class ComplexityMetrics:
     """Generic complexity metrics for code analysis
 
@@ -53,7 +73,7 @@ class ComplexityMetrics:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FunctionInfo:
     """Information about a function or method
 
@@ -81,7 +101,7 @@ class FunctionInfo:
         return self.line_end - self.line_start + 1
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ClassInfo:
     """Information about a class
 
@@ -100,10 +120,56 @@ class ClassInfo:
     methods: List[FunctionInfo]
 
 
-@dataclass
+# Commit message keywords for troubleshooting and ADR records. These match
+# anywhere in the message so that e.g. "fixed" and "bugs" still count.
+_BUG_RE = re.compile(r"fix|bug|error", re.IGNORECASE)
+_ADR_RE = re.compile(r"decision|选型|architecture", re.IGNORECASE)
+
+# Files larger than this are typically generated or bundled code
+MAX_ANALYZE_BYTES = 1024 * 1024
+
+# Path components of vendored dependencies and build output
+_VENDOR_PARTS = frozenset(["node_modules", "dist", "vendor", "__pycache__"])
+
+# (function count, starts, ends, running max ends, original positions)
+_FunctionIndex = Tuple[int, List[int], List[int], List[int], List[int]]
+
+
+class _LazyContainer:
+    """Dataclass field whose container is only allocated when first read
+
+    The value lives in a private slot named after the field; None there
+    means no container has been allocated yet.
+    """
+
+    def __init__(self, factory: type):
+        self._factory = factory
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = "_" + name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        # Accessed on the class, e.g. by dataclass: the field default
+        if obj is None:
+            return None
+        value = getattr(obj, self._slot)
+        if value is None:
+            value = self._factory()
+            setattr(obj, self._slot, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self._slot, value)
+
+
+@dataclass(init=False, eq=False)
 class AnalysisResult:
     """Result of code analysis
 
+    The functions, classes, imports and metadata containers are only
+    allocated when first accessed, so empty results (e.g. for unreadable
+    files) carry no containers at all.
+
     Attributes:
         file_path: Path to the analyzed file
         language: Programming language
@@ -116,25 +182,62 @@ class AnalysisResult:
         metadata: Additional metadata
     """
 
+    # Listed by hand: the lazy fields are stored in private slots, which
+    # dataclass slots=True cannot express. _function_index is a lazily
+    # built lookup index over functions, see _get_function_index().
+    __slots__ = (
+        "file_path", "language", "layers", "actions", "complexity",
+        "_functions", "_classes", "_imports", "_metadata", "_function_index",
+    )
+
     file_path: str
     language: str
     layers: List[str]
     actions: List[Dict[str, Any]]
-    complexity: Optional[ComplexityMetrics] = None
-    functions: List[FunctionInfo] = None
-    classes: List[ClassInfo] = None
-    imports: List[str] = None
-    metadata: Dict[str, Any] = None
-
-    def __post_init__(self):
-        if self.functions is None:
-            self.functions = []
-        if self.classes is None:
-            self.classes = []
-        if self.imports is None:
-            self.imports = []
-        if self.metadata is None:
-            self.metadata = {}
+    complexity: Optional[ComplexityMetrics]
+    functions: List[FunctionInfo] = _LazyContainer(list)
+    classes: List[ClassInfo] = _LazyContainer(list)
+    imports: List[str] = _LazyContainer(list)
+    metadata: Dict[str, Any] = _LazyContainer(dict)
+
+    def __init__(
+        self,
+        file_path: str,
+        language: str,
+        layers: List[str],
+        actions: List[Dict[str, Any]],
+        complexity: Optional[ComplexityMetrics] = None,
+        functions: Optional[List[FunctionInfo]] = None,
+        classes: Optional[List[ClassInfo]] = None,
+        imports: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.file_path = file_path
+        self.language = language
+        self.layers = layers
+        self.actions = actions
+        self.complexity = complexity
+        self._functions = functions
+        self._classes = classes
+        self._imports = imports
+        self._metadata = metadata
+        self._function_index = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        # Unallocated containers compare equal to empty ones
+        return (
+            self.file_path == other.file_path
+            and self.language == other.language
+            and self.layers == other.layers
+            and self.actions == other.actions
+            and self.complexity == other.complexity
+            and (self._functions or []) == (other._functions or [])
+            and (self._classes or []) == (other._classes or [])
+            and (self._imports or []) == (other._imports or [])
+            and (self._metadata or {}) == (other._metadata or {})
+        )
 
     def has_high_complexity(self) -> bool:
         """Check if the analyzed code has high complexity"""
@@ -151,16 +254,72 @@ class AnalysisResult:
         Returns:
             List of changed functions
         """
-        if not changed_lines:
+        if not changed_lines or not self._functions:
             return []
 
+        lines = sorted(set(changed_lines))
+
+        if len(lines) < len(self.functions):
+            return self._functions_containing(lines)
+
+        # Many changed lines: each function needs a single binary search
+        # for the first changed line at or after its start
+        last = len(lines)
         changed = []
         for func in self.functions:
-            # Check if any changed line is within this function
-            if any(func.line_start <= line <= func.line_end for line in changed_lines):
+            i = bisect_left(lines, func.line_start)
+            if i < last and lines[i] <= func.line_end:
                 changed.append(func)
         return changed
 
+    def _functions_containing(self, lines: List[int]) -> List[FunctionInfo]:
+        """Find functions containing any of a few lines via the start index
+
+        Args:
+            lines: Sorted line numbers
+
+        Returns:
+            Matching functions in their original order
+        """
+        _, starts, ends, max_ends, order = self._get_function_index()
+
+        hits = set()
+        for line in lines:
+            # Walk left from the last function starting at or before the line
+            # until no earlier function can still extend past it
+            i = bisect_right(starts, line) - 1
+            while i >= 0 and max_ends[i] >= line:
+                if ends[i] >= line:
+                    hits.add(order[i])
+                i -= 1
+
+        return [self.functions[i] for i in sorted(hits)]
+
+    def _get_function_index(self) -> _FunctionIndex:
+        """Get functions sorted by start line, with a running max of end lines
+
+        The index is rebuilt if the number of functions has changed.
+
+        Returns:
+            Tuple of (function count, starts, ends, running max ends,
+            original positions)
+        """
+        index = self._function_index
+        if index is None or index[0] != len(self.functions):
+            order = sorted(
+                range(len(self.functions)), key=lambda i: self.functions[i].line_start
+            )
+            starts = [self.functions[i].line_start for i in order]
+            ends = [self.functions[i].line_end for i in order]
+            max_ends = []
+            running = 0
+            for end in ends:
+                running = max(running, end)
+                max_ends.append(running)
+            index = (len(self.functions), starts, ends, max_ends, order)
+            self._function_index = index
+        return index
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -169,13 +328,85 @@ class AnalysisResult:
             "layers": self.layers,
             "actions": self.actions,
             "complexity": self.complexity.to_dict() if self.complexity else None,
-            "function_count": len(self.functions),
-            "class_count": len(self.classes),
-            "imports": self.imports,
-            "metadata": self.metadata,
+            "function_count": len(self._functions) if self._functions else 0,
+            "class_count": len(self._classes) if self._classes else 0,
+            "imports": self._imports if self._imports is not None else [],
+            "metadata": self._metadata if self._metadata is not None else {},
         }
 
 
+@lru_cache(maxsize=256)
+def _message_layers(commit_message: str) -> Tuple[str, ...]:
+    """Get the document layers implied by a commit message
+
+    Args:
+        commit_message: Commit message
+
+    Returns:
+        Layer names
+    """
+    # Check commit message for troubleshooting or ADR keywords
+    if _BUG_RE.search(commit_message) or _ADR_RE.search(commit_message):
+        return ("memo", "traditional")
+
+    # Default: always consider traditional docs
+    return ("traditional",)
+
+
+@lru_cache(maxsize=4096)
+def _file_type(file_path: Union[str, Path]) -> str:
+    """Detect the type/category of a file, memoized per path
+
+    Args:
+        file_path: Path to the file, as a string or an existing Path
+
+    Returns:
+        File type (e.g., "service", "model", "utility")
+    """
+    path = file_path if isinstance(file_path, Path) else Path(file_path)
+    parent = path.parent.name.lower()
+
+    # Check directory names
+    if "service" in parent:
+        return "service"
+    if "model" in parent:
+        return "model"
+    if "util" in parent:
+        return "utility"
+    if "test" in parent:
+        return "test"
+
+    # Check file name
+    if path.name.startswith("test_"):
+        return "test"
+
+    return "unknown"
+
+
+def read_shebang(file_path: str) -> bytes:
+    """Read the shebang line of a file
+
+    Only the first 128 bytes are read, without a buffered text reader.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        First line if it starts with "#!", otherwise b""
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            head = os.read(fd, 128)
+        finally:
+            os.close(fd)
+    except OSError:
+        return b""
+
+    first_line = head.split(b"\n", 1)[0]
+    return first_line if first_line.startswith(b"#!") else b""
+
+
 class BaseAnalyzer(ABC):
     """Base class for code analyzers
 
@@ -186,6 +417,22 @@ class BaseAnalyzer(ABC):
     # File extensions this analyzer handles
     extensions: List[str] = []
 
+    # Interpreter names recognized in a shebang line (e.g. b"bash")
+    interpreters: List[bytes] = []
+
+    # Skip vendored, minified and oversized files without reading them
+    skip_vendored: bool = False
+
+    # Keywords counted as branches by calculate_complexity(); compiled once
+    # per class into _branch_re when the class is defined
+    branching_keywords: Tuple[str, ...] = _BRANCH_KEYWORDS
+    _branch_re = _compile_keywords(_BRANCH_KEYWORDS)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "branching_keywords" in cls.__dict__:
+            cls._branch_re = _compile_keywords(cls.branching_keywords)
+
     @property
     @abstractmethod
     def language(self) -> str:
@@ -219,77 +466,90 @@ class BaseAnalyzer(ABC):
         """
         pass
 
-    def calculate_complexity(self, source: str) -> ComplexityMetrics:
+    def should_skip(self, path: Path, size: int) -> bool:
+        """Check if a file is not worth analyzing
+
+        Args:
+            path: Path to the file
+            size: File size in bytes
+
+        Returns:
+            True for vendored, minified or oversized files when this
+            analyzer skips them
+        """
+        return self.skip_vendored and (
+            size > MAX_ANALYZE_BYTES
+            or ".min." in path.name
+            or not _VENDOR_PARTS.isdisjoint(path.parts)
+        )
+
+    def calculate_complexity(
+        self, source: str, lines: Optional[List[str]] = None
+    ) -> ComplexityMetrics:
         """Calculate basic complexity metrics from source code
 
         Args:
             source: Source code string
+            lines: source already split on "\n", to avoid splitting again
 
         Returns:
             ComplexityMetrics object
         """
-        lines = source.split("\n")
+        if lines is None:
+            lines = source.split("\n")
 
         line_count = len(lines)
         code_lines = 0
         nesting_depth = 0
         max_nesting = 0
+        complexity = 1  # Base complexity
+        branch_search = self._branch_re.search
 
         for line in lines:
             stripped = line.strip()
-            if stripped and not stripped.startswith("#"):
+            if not stripped:
+                continue
+
+            is_comment = stripped[0] == "#"
+            if not is_comment:
                 code_lines += 1
 
             # Track nesting
-            if "{" in line or ":" in line and not stripped.startswith("#"):
+            if "{" in stripped or ":" in stripped and not is_comment:
                 nesting_depth += 1
-                max_nesting = max(max_nesting, nesting_depth)
-            if "}" in line:
-                nesting_depth = max(0, nesting_depth - 1)
+                if nesting_depth > max_nesting:
+                    max_nesting = nesting_depth
+            if "}" in stripped and nesting_depth:
+                nesting_depth -= 1
+
+            # Count branching keywords
+            if branch_search(stripped):
+                complexity += 1
 
         return ComplexityMetrics(
             line_count=line_count,
             code_lines=code_lines,
             nesting_depth=max_nesting,
-            complexity_score=self._calculate_cyclomatic(source),
+            complexity_score=complexity,
         )
 
-    def _calculate_cyclomatic(self, source: str) -> int:
-        """Calculate cyclomatic complexity estimate
-
-        Args:
-            source: Source code string
-
-        Returns:
-            Estimated cyclomatic complexity
-        """
-        # Count branching keywords
-        keywords = [
-            "if", "else", "elif", "for", "while", "case", "switch",
-            "catch", "try", "except", "finally", "and", "or"
-        ]
-
-        complexity = 1  # Base complexity
-        for line in source.split("\n"):
-            stripped = line.strip()
-            for keyword in keywords:
-                if stripped.startswith(keyword + " ") or keyword + " " in stripped:
-                    complexity += 1
-                    break
-
-        return complexity
-
-    def extract_imports(self, source: str) -> List[str]:
+    def extract_imports(
+        self, source: str, lines: Optional[List[str]] = None
+    ) -> List[str]:
         """Extract import statements from source
 
         Args:
             source: Source code string
+            lines: source already split on "\n", to avoid splitting again
 
         Returns:
             List of import statements
         """
+        if lines is None:
+            lines = source.split("\n")
+
         imports = []
-        for line in source.split("\n"):
+        for line in lines:
             stripped = line.strip()
             if stripped.startswith("import ") or stripped.startswith("from "):
                 imports.append(stripped)
@@ -307,46 +567,64 @@ class BaseAnalyzer(ABC):
         Returns:
             List of layer names
         """
-        context = context or {}
-        layers = []
+        # Every file in a commit shares the message, so this is memoized
+        return list(_message_layers((context or {}).get("commit_message", "")))
 
-        # Check commit message for keywords
-        commit_message = context.get("commit_message", "").lower()
+    def detect_file_type(self, file_path: Union[str, Path]) -> str:
+        """Detect the type/category of a file
+
+        Args:
+            file_path: Path to the file, as a string or an existing Path
 
-        if any(kw in commit_message for kw in ["fix", "bug", "error"]):
-            layers.append("memo")  # Troubleshooting record
+        Returns:
+            File type (e.g., "service", "model", "utility")
+        """
+        return _file_type(file_path)
 
-        if any(kw in commit_message for kw in ["decision", "选型", "architecture"]):
-            layers.append("memo")  # ADR record
 
-        # Default: always consider traditional docs
-        layers.append("traditional")
+class GenericAnalyzer(BaseAnalyzer):
+    """Fallback analyzer for files no language analyzer handles
 
-        return list(set(layers))
+    Uses the line-based heuristics from BaseAnalyzer.
+    """
 
-    def detect_file_type(self, file_path: str) -> str:
-        """Detect the type/category of a file
+    @property
+    def language(self) -> str:
+        return "Unknown"
+
+    def can_analyze(self, file_path: str) -> bool:
+        """Any file can be analyzed generically"""
+        return True
+
+    def analyze(
+        self, file_path: str, context: Optional[Dict[str, Any]] = None
+    ) -> AnalysisResult:
+        """Analyze a file using line-based heuristics
 
         Args:
-            file_path: Path to the file
+            file_path: Path to the file to analyze
+            context: Additional context
 
         Returns:
-            File type (e.g., "service", "model", "utility")
+            AnalysisResult with findings
         """
-        path = Path(file_path)
-
-        # Check directory names
-        if "service" in path.parent.name.lower():
-            return "service"
-        if "model" in path.parent.name.lower():
-            return "model"
-        if "util" in path.parent.name.lower():
-            return "utility"
-        if "test" in path.parent.name.lower():
-            return "test"
-
-        # Check file name
-        if path.name.startswith("test_"):
-            return "test"
-
-        return "unknown"
+        try:
+            source = Path(file_path).read_text()
+        except (IOError, UnicodeDecodeError):
+            return AnalysisResult(
+                file_path=file_path,
+                language=self.language,
+                layers=[],
+                actions=[],
+            )
+
+        lines = source.split("\n")
+        return AnalysisResult(
+            file_path=file_path,
+            language=self.language,
+            layers=self.detect_layers(file_path, context),
+            actions=[],
+            complexity=self.calculate_complexity(source, lines),
+            imports=self.extract_imports(source, lines),
+            metadata={"file_type": self.detect_file_type(file_path)},
+        )
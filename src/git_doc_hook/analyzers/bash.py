@@ -2,22 +2,39 @@
 
 Provides analysis for shell scripts and bash files.
 """
+import mmap
+import os
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+from git_doc_hook.analyzers._cache import cached_analysis
 from git_doc_hook.analyzers.base import (
     BaseAnalyzer,
     AnalysisResult,
     ComplexityMetrics,
     FunctionInfo,
+    read_shebang,
 )
 
+# Patterns work on raw bytes; scripts are scanned without decoding them
+
+# Function definitions: "function name", "function name()", "name()", "name() {"
+_FUNC_RE = re.compile(rb'^(?:function\s+(\w+)|(\w+)\s*\(\s*\))')
+
+# Control flow counted towards cyclomatic complexity
+_CONTROL_RE = re.compile(rb'\b(?:if|then|elif|else|for|while|case|esac)\b|\|\||&&')
+
+# Keywords opening and closing a nesting level
+_NEST_OPEN_RE = re.compile(rb'\b(?:if|then|for|while|case)\b')
+_NEST_CLOSE_RE = re.compile(rb'\b(?:fi|done|esac)\b')
+
 
 class BashAnalyzer(BaseAnalyzer):
     """Analyzer for Bash/Shell scripts"""
 
     extensions = [".sh", ".bash", ".zsh"]
+    interpreters = [b"bash", b"sh", b"zsh"]
 
     @property
     def language(self) -> str:
@@ -32,25 +49,32 @@ class BashAnalyzer(BaseAnalyzer):
             return True
 
         # Check shebang
-        try:
-            first_line = path.open().readline()
-            if first_line.startswith("#!") and any(
-                shell in first_line for shell in ["bash", "sh", "zsh"]
-            ):
-                return True
-        except (IOError, UnicodeDecodeError):
-            pass
-
-        return False
+        first_line = read_shebang(file_path)
+        return any(shell in first_line for shell in self.interpreters)
 
+    @cached_analysis
     def analyze(
-        self, file_path: str, context: Optional[Dict[str, Any]] = None
+        self,
+        file_path: str,
+        context: Optional[Dict[str, Any]] = None,
+        prior: Optional[AnalysisResult] = None,
+        changed_lines: Optional[List[int]] = None,
+        entry: Optional[os.DirEntry] = None,
     ) -> AnalysisResult:
         """Analyze a Bash script
 
+        When a previous result for the same file and the changed line
+        numbers (in the new version) are given, only the changed range is
+        re-scanned for functions; functions outside it are reused from
+        the previous result and shifted by the net line delta.
+
         Args:
             file_path: Path to the script
             context: Additional context
+            prior: Previous AnalysisResult for this file
+            changed_lines: Line numbers changed since the previous result
+            entry: os.scandir() entry for file_path; its cached stat
+                   result is reused instead of stat-ing the file again
 
         Returns:
             AnalysisResult with findings
@@ -58,19 +82,23 @@ class BashAnalyzer(BaseAnalyzer):
         path = Path(file_path)
 
         try:
-            source = path.read_text()
-        except (IOError, UnicodeDecodeError):
+            lines = self._read_lines(path)
+        except (OSError, ValueError):
             return self._empty_result(file_path)
 
         # Extract information
-        functions = self._extract_functions(source)
-        imports = self._extract_sources(source)
-        complexity = self._calculate_complexity_bash(source)
+        functions = None
+        if prior is not None and changed_lines:
+            functions = self._reuse_functions(prior, lines, changed_lines)
+        if functions is None:
+            functions = self._extract_functions(lines)
+        imports = self._extract_sources(lines)
+        complexity = self._calculate_complexity_bash(lines, len(functions))
 
         # Determine layers and actions
         context = context or {}
         layers = self.detect_layers(file_path, context)
-        actions = self._determine_actions(file_path, context, complexity)
+        actions = self._determine_actions(file_path, path, context, complexity)
 
         return AnalysisResult(
             file_path=file_path,
@@ -81,9 +109,9 @@ class BashAnalyzer(BaseAnalyzer):
             functions=functions,
             imports=imports,
             metadata={
-                "file_type": self.detect_file_type(file_path),
-                "has_shebang": source.startswith("#!"),
-                "is_executable": self._is_executable(path),
+                "file_type": self.detect_file_type(path),
+                "has_shebang": lines[0].startswith(b"#!"),
+                "is_executable": self._is_executable(entry or path),
             },
         )
 
@@ -96,108 +124,161 @@ class BashAnalyzer(BaseAnalyzer):
             actions=[],
         )
 
-    def _extract_functions(self, source: str) -> List[FunctionInfo]:
+    def _read_lines(self, path: Path) -> List[bytes]:
+        """Read a script as stripped byte lines
+
+        The file is memory-mapped and split line by line, so it is never
+        copied or decoded as a whole.
+
+        Args:
+            path: Path to the script
+
+        Returns:
+            Stripped lines; like str.split("\\n"), a trailing newline
+            yields a final empty line
+        """
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return [b""]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                lines = [line.strip() for line in iter(buf.readline, b"")]
+                if buf[-1:] == b"\n":
+                    lines.append(b"")
+        return lines
+
+    def _extract_functions(
+        self, lines: List[bytes], first_line: int = 1
+    ) -> List[FunctionInfo]:
         """Extract function definitions
 
         Args:
-            source: Source code
+            lines: Stripped source lines, as bytes
+            first_line: Line number of the first entry in lines
 
         Returns:
             List of FunctionInfo objects
         """
         functions = []
-        lines = source.split("\n")
-
-        # Pattern for function definitions
-        # Supports: function_name() {, function function_name {, function function_name()
-        patterns = [
-            r'^(\w+)\s*\(\s*\)\s*{',  # standard function_name() {
-            r'^function\s+(\w+)\s*',   # function keyword
-            r'^(\w+)\s*\(\s*\)',        # function_name()
-        ]
 
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
+        for i, line in enumerate(lines, first_line):
             # Skip comments and empty lines
-            if not line or line.startswith("#"):
+            if not line or line.startswith(b"#"):
                 continue
 
-            for pattern in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    functions.append(
-                        FunctionInfo(
-                            name=match.group(1),
-                            line_start=i,
-                            line_end=i,
-                            parameters=[],
-                            decorators=[],
-                            is_method=False,
-                            is_async=False,
-                        )
+            match = _FUNC_RE.match(line)
+            if match:
+                name = match.group(1) or match.group(2)
+                functions.append(
+                    FunctionInfo(
+                        name=name.decode("utf-8", "replace"),
+                        line_start=i,
+                        line_end=i,
+                        parameters=[],
+                        decorators=[],
+                        is_method=False,
+                        is_async=False,
                     )
-                    break
+                )
 
         return functions
 
-    def _extract_sources(self, source: str) -> List[str]:
-        """Extract source/include statements
+    def _reuse_functions(
+        self,
+        prior: AnalysisResult,
+        lines: List[bytes],
+        changed_lines: List[int],
+    ) -> Optional[List[FunctionInfo]]:
+        """Patch a previous function list for a contiguous changed range
 
         Args:
-            source: Source code
+            prior: Previous AnalysisResult for this file
+            lines: Stripped byte lines of the new version
+            changed_lines: Changed line numbers in the new version
 
         Returns:
-            List of source statements
+            Updated list of FunctionInfo objects, or None if the previous
+            result cannot be reused and a full scan is needed
         """
-        sources = []
+        if prior.complexity is None or prior.language != self.language:
+            return None
+
+        lo, hi = min(changed_lines), max(changed_lines)
+        delta = len(lines) - prior.complexity.line_count
+        old_hi = hi - delta  # End of the changed range in the previous version
+        if lo < 1 or hi > len(lines) or old_hi < lo - 1:
+            return None
+
+        before = [f for f in prior.functions if f.line_start < lo]
+        after = [
+            FunctionInfo(
+                name=f.name,
+                line_start=f.line_start + delta,
+                line_end=f.line_end + delta,
+                parameters=f.parameters,
+                decorators=f.decorators,
+                is_method=f.is_method,
+                is_async=f.is_async,
+            )
+            for f in prior.functions
+            if f.line_start > old_hi
+        ]
+        window = self._extract_functions(lines[lo - 1:hi], first_line=lo)
 
-        for line in source.split("\n"):
-            line = line.strip()
-            if line.startswith("source ") or line.startswith(". "):
-                sources.append(line)
+        return before + window + after
 
-        return sources
+    def _extract_sources(self, lines: List[bytes]) -> List[str]:
+        """Extract source/include statements
+
+        Args:
+            lines: Stripped source lines, as bytes
+
+        Returns:
+            List of source statements
+        """
+        return [
+            line.decode("utf-8", "replace") for line in lines
+            if line.startswith(b"source ") or line.startswith(b". ")
+        ]
 
-    def _calculate_complexity_bash(self, source: str) -> ComplexityMetrics:
-        """Calculate complexity metrics
+    def _calculate_complexity_bash(
+        self, lines: List[bytes], function_count: int
+    ) -> ComplexityMetrics:
+        """Calculate complexity metrics, including nesting depth, in one pass
 
         Args:
-            source: Source code
+            lines: Stripped source lines, as bytes
+            function_count: Number of functions already extracted
 
         Returns:
             ComplexityMetrics object
         """
-        lines = source.split("\n")
-        line_count = len(lines)
-
-        # Count code lines (non-blank, non-comment)
         code_lines = 0
-        for line in lines:
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#"):
-                code_lines += 1
-
-        # Calculate cyclomatic complexity
         complexity_score = 1  # Base complexity
-        control_flow = ["if", "then", "elif", "else", "for", "while", "case", "esac", "||", "&&"]
+        max_nesting = 0
+        current_depth = 0
+
+        for stripped in lines:
+            is_code = bool(stripped) and not stripped.startswith(b"#")
 
-        for line in lines:
-            stripped = line.strip()
-            for keyword in control_flow:
-                if keyword in stripped and not stripped.startswith("#"):
+            if is_code:
+                # Count code lines (non-blank, non-comment)
+                code_lines += 1
+
+                # Cyclomatic complexity
+                if _CONTROL_RE.search(stripped):
                     complexity_score += 1
-                    break
 
-        # Count functions
-        function_count = len(
-            [l for l in lines if re.match(r'^\s*(function\s+)?\w+\s*\(\s*\)', l)]
-        )
+                # Keywords that increase nesting
+                if _NEST_OPEN_RE.search(stripped):
+                    current_depth += 1
+                    max_nesting = max(max_nesting, current_depth)
 
-        # Calculate max nesting depth
-        max_nesting = self._calculate_nesting_depth(source)
+            # Keywords that decrease nesting
+            if _NEST_CLOSE_RE.search(stripped):
+                current_depth = max(0, current_depth - 1)
 
         return ComplexityMetrics(
-            line_count=line_count,
+            line_count=len(lines),
             code_lines=code_lines,
             nesting_depth=max_nesting,
             complexity_score=complexity_score,
@@ -205,51 +286,25 @@ class BashAnalyzer(BaseAnalyzer):
             param_count=0,  # Bash functions don't have explicit parameters
         )
 
-    def _calculate_nesting_depth(self, source: str) -> int:
-        """Calculate maximum nesting depth
-
-        Args:
-            source: Source code
-
-        Returns:
-            Maximum nesting depth
-        """
-        max_depth = 0
-        current_depth = 0
-
-        for line in source.split("\n"):
-            stripped = line.strip()
-
-            # Keywords that increase nesting
-            if any(
-                kw in stripped for kw in ["if", "then", "for", "while", "case"]
-            ) and not stripped.startswith("#"):
-                current_depth += 1
-                max_depth = max(max_depth, current_depth)
-
-            # Keywords that decrease nesting
-            if any(kw in stripped for kw in ["fi", "done", "esac"]):
-                current_depth = max(0, current_depth - 1)
-
-        return max_depth
-
-    def _is_executable(self, path: Path) -> bool:
+    def _is_executable(self, path_or_entry: Union[Path, os.DirEntry]) -> bool:
         """Check if file is executable
 
         Args:
-            path: Path to file
+            path_or_entry: Path to file, or an os.scandir() entry whose
+                           stat result is cached
 
         Returns:
             True if executable
         """
         try:
-            return path.stat().st_mode & 0o111 != 0
+            return path_or_entry.stat().st_mode & 0o111 != 0
         except OSError:
             return False
 
     def _determine_actions(
         self,
         file_path: str,
+        path: Path,
         context: Dict[str, Any],
         complexity: ComplexityMetrics,
     ) -> List[Dict[str, Any]]:
@@ -257,6 +312,7 @@ class BashAnalyzer(BaseAnalyzer):
 
         Args:
             file_path: Path to the script
+            path: file_path as a Path
             context: Analysis context
             complexity: Complexity metrics
 
@@ -264,7 +320,6 @@ class BashAnalyzer(BaseAnalyzer):
             List of action definitions
         """
         actions = []
-        path = Path(file_path)
 
         # Check if this is a tool/script
         if "tool" in path.parts or "tools" in path.parts or "bin" in path.parts:
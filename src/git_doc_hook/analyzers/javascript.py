@@ -1,12 +1,15 @@
 """JavaScript/TypeScript code analyzer
 
 Provides analysis for JavaScript and TypeScript files using
-pattern matching and AST-like parsing.
+line-oriented pattern matching. No JavaScript parser is required; the
+patterns are compiled once per process and each scan is linear in the
+size of the file.
 """
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from git_doc_hook.analyzers._cache import cached_analysis
 from git_doc_hook.analyzers.base import (
     BaseAnalyzer,
     AnalysisResult,
@@ -15,11 +18,101 @@ from git_doc_hook.analyzers.base import (
     ClassInfo,
 )
 
+# Function declarations and method definitions, tried in order per line
+_FUNC_PATTERNS = [
+    re.compile(r'function\s+(\w+)\s*\('),
+    re.compile(r'(\w+)\s*:\s*function\s*\('),
+    re.compile(r'(\w+)\s*\([^)]*\)\s*{'),  # ES6 arrow functions and methods
+    re.compile(r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>'),
+]
+# Union of _FUNC_PATTERNS, used to find candidate lines in a single scan of
+# the source. [^\S\n] stands in for \s so no match crosses a newline, and a
+# leading (\w+) is anchored with \b: a match inside a word implies one at
+# the word start, so the mid-word attempts are wasted work.
+_FUNC_UNION = re.compile(
+    r'function[^\S\n]+\w+[^\S\n]*\('
+    r'|\b\w+[^\S\n]*:[^\S\n]*function[^\S\n]*\('
+    r'|\b\w+[^\S\n]*\([^)\n]*\)[^\S\n]*{'
+    r'|const[^\S\n]+\w+[^\S\n]*=[^\S\n]*(?:async[^\S\n]+)?\([^)\n]*\)[^\S\n]*=>'
+)
+_ASYNC_RE = re.compile(r'\basync\b')
+_SKIP_NAMES = frozenset(["if", "for", "while", "switch", "catch"])
+_PARAM_RE = re.compile(r'\(([^)]*)\)')
+# Class declarations; [^\S\n] stands in for \s so no match crosses a line
+_CLASS_RE = re.compile(r'class[^\S\n]+(\w+)(?:[^\S\n]+extends[^\S\n]+(\w+))?')
+# import ... from "x", import "x" and require("x"). Matched from the start of
+# a stripped line; [^'"] keeps the lazy scan for "from" inside the
+# specifier list instead of backtracking over the whole line.
+_IMPORT_RE = re.compile(
+    r'import\s+(?:[^\'"]*?\s+from\s+)?[\'"][^\'"]+[\'"]'
+    r'|require\([\'"][^\'"]+[\'"]\)'
+)
+_IMPORT_PREFIXES = ("import", "require(")
+_EXPORT_RE = re.compile(r'export\s+(default\s+)?|module\.exports')
+
+# Patterns counted towards ComplexityMetrics.function_count: "function name",
+# and the word-prefixed forms "name: function" and "name(...) {". The
+# latter are searched by their tail only, see _count_word_prefixed(); group
+# 1 ends where the full pattern's match would end.
+_FUNC_KEYWORD_RE = re.compile(r'function\s+\w+')
+_WORD_PREFIXED_TAILS = [
+    re.compile(r':(?=(\s*function))'),  # \w+\s*:\s*function
+    re.compile(r'\((?=([^)]*\)\s*{))'),  # \w+\s*\([^)]*\)\s*{
+]
+_WORD_CHAR_RE = re.compile(r'\w')
+_CLASS_COUNT_RE = re.compile(r'class\s+\w+')
+
+# Per-line checks for code lines and cyclomatic complexity
+_COMMENT_PREFIXES = ("//", "/*")
+_CONTROL_RE = re.compile(r'\b(?:if|else|for|while|case|catch|switch)\b|&&|\|\|')
+
+# Comments and string/template literals, whose braces don't open blocks
+_NON_CODE_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/'
+    # Strings are written as unrolled loops, without an alternation per character
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+    r'|`[^`\\]*(?:\\.[^`\\]*)*`',
+    re.DOTALL,
+)
+_NON_BRACE_RE = re.compile(r'[^{}]+')
+
+
+def _count_word_prefixed(tail: "re.Pattern[str]", source: str) -> int:
+    """Count non-overlapping matches of \\w+\\s*<tail> in source
+
+    Gives the same count as finditer() on the full pattern. Scanning for a
+    leading \\w+ retries at every character of every identifier, whereas
+    the tail starts with a literal the regex engine can skip to, so only
+    those few positions are checked for a preceding word.
+
+    Args:
+        tail: Pattern for the part after \\s*, whose group 1 ends where
+              the full match ends
+        source: Source code
+
+    Returns:
+        Number of matches
+    """
+    count = 0
+    prev_end = 0
+    for match in tail.finditer(source):
+        word_end = match.start()
+        while word_end > prev_end and source[word_end - 1].isspace():
+            word_end -= 1
+        # The word must have a character after the previous match
+        if word_end > prev_end and _WORD_CHAR_RE.match(source, word_end - 1):
+            count += 1
+            prev_end = match.end(1)
+    return count
+
 
 class JavaScriptAnalyzer(BaseAnalyzer):
     """Analyzer for JavaScript/TypeScript code"""
 
     extensions = [".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"]
+    interpreters = [b"node"]
+    skip_vendored = True
 
     @property
     def language(self) -> str:
@@ -29,6 +122,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         """Check if file is a JavaScript/TypeScript file"""
         return Path(file_path).suffix.lower() in self.extensions
 
+    @cached_analysis
     def analyze(
         self, file_path: str, context: Optional[Dict[str, Any]] = None
     ) -> AnalysisResult:
@@ -44,23 +138,27 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         path = Path(file_path)
 
         try:
-            source = path.read_text()
-        except (IOError, UnicodeDecodeError):
+            if self.should_skip(path, path.stat().st_size):
+                return self._empty_result(file_path)
+            # Undecodable bytes are replaced rather than failing the file
+            source = path.read_bytes().decode("utf-8", "replace")
+        except OSError:
             return self._empty_result(file_path)
 
         # Detect if TypeScript
         is_typescript = path.suffix in [".ts", ".tsx"]
 
-        # Extract information
+        # Extract information; the line-based helpers share one split
+        lines = source.split("\n")
         functions = self._extract_functions(source)
         classes = self._extract_classes(source)
-        imports = self._extract_imports_js(source)
-        complexity = self._calculate_complexity_js(source)
+        imports = self._extract_imports_js(lines)
+        complexity = self._calculate_complexity_js(source, lines)
 
         # Determine layers and actions
         context = context or {}
         layers = self.detect_layers(file_path, context)
-        actions = self._determine_actions(file_path, context, complexity)
+        actions = self._determine_actions(file_path, path, context, complexity)
 
         return AnalysisResult(
             file_path=file_path,
@@ -72,7 +170,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
             classes=classes,
             imports=imports,
             metadata={
-                "file_type": self.detect_file_type(file_path),
+                "file_type": self.detect_file_type(path),
                 "is_typescript": is_typescript,
                 "has_classes": len(classes) > 0,
                 "has_exports": self._has_exports(source),
@@ -98,158 +196,176 @@ class JavaScriptAnalyzer(BaseAnalyzer):
             List of FunctionInfo objects
         """
         functions = []
+        search = _FUNC_UNION.search
+        pos = 0
+        line_no = 1  # Line number of the line starting at pos
+
+        # Jump from one candidate line to the next instead of trying
+        # every pattern on every line
+        while True:
+            match = search(source, pos)
+            if match is None:
+                break
+
+            line_start = source.rfind("\n", 0, match.start()) + 1
+            line_end = source.find("\n", match.end())
+            if line_end == -1:
+                line_end = len(source)
+
+            line_no += source.count("\n", pos, line_start)
+
+            func = self._match_function(source[line_start:line_end], line_no)
+            if func is not None:
+                functions.append(func)
+            pos = line_end + 1
+            line_no += 1
 
-        # Pattern for function declarations and method definitions
-        patterns = [
-            r'function\s+(\w+)\s*\(',
-            r'(\w+)\s*:\s*function\s*\(',
-            r'(\w+)\s*\([^)]*\)\s*{',  # ES6 arrow functions and methods
-            r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>',
-        ]
+        return functions
 
-        lines = source.split("\n")
+    def _match_function(self, line: str, line_no: int) -> Optional[FunctionInfo]:
+        """Match a function definition on a single line
 
-        for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                match = re.search(pattern, line)
-                if match:
-                    name = match.group(1)
-                    # Skip common non-function patterns
-                    if name in ["if", "for", "while", "switch", "catch"]:
-                        continue
-
-                    # Extract parameters
-                    params = []
-                    param_match = re.search(r'\(([^)]*)\)', line)
-                    if param_match:
-                        param_str = param_match.group(1)
-                        if param_str.strip():
-                            params = [p.strip() for p in param_str.split(",")]
-
-                    functions.append(
-                        FunctionInfo(
-                            name=name,
-                            line_start=i,
-                            line_end=i,  # Would need full parsing for end line
-                            parameters=params,
-                            decorators=[],
-                            is_method=False,
-                            is_async="async" in line,
-                        )
-                    )
-                    break
+        Args:
+            line: Source line
+            line_no: Line number of the line
 
-        return functions
+        Returns:
+            FunctionInfo for the first pattern that matches, or None
+        """
+        for pattern in _FUNC_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                name = match.group(1)
+                # Skip common non-function patterns
+                if name in _SKIP_NAMES:
+                    continue
+
+                # Extract parameters
+                params = []
+                param_match = _PARAM_RE.search(line)
+                if param_match:
+                    param_str = param_match.group(1)
+                    if param_str.strip():
+                        params = [p.strip() for p in param_str.split(",")]
+
+                return FunctionInfo(
+                    name=name,
+                    line_start=line_no,
+                    line_end=line_no,  # Would need full parsing for end line
+                    parameters=params,
+                    decorators=[],
+                    is_method=False,
+                    # async precedes the name, or the arrow parameters
+                    is_async=_ASYNC_RE.search(line, 0, match.end()) is not None,
+                )
+
+        return None
 
     def _extract_classes(self, source: str) -> List[ClassInfo]:
         """Extract class definitions
 
+        The source is scanned once; line numbers come from counting the
+        newlines between consecutive matches.
+
         Args:
             source: Source code
 
         Returns:
-            List of ClassInfo objects
+            List of ClassInfo objects (at most one per line)
         """
         classes = []
-        lines = source.split("\n")
-
-        # Pattern for class declarations
-        class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?'
-
-        for i, line in enumerate(lines, 1):
-            match = re.search(class_pattern, line)
-            if match:
-                name = match.group(1)
-                base = match.group(2)
-
-                classes.append(
-                    ClassInfo(
-                        name=name,
-                        line_start=i,
-                        line_end=i,
-                        bases=[base] if base else [],
-                        methods=[],
-                    )
+        pos = 0
+        line_no = 1  # Line number at pos
+
+        for match in _CLASS_RE.finditer(source):
+            line_no += source.count("\n", pos, match.start())
+            pos = match.start()
+
+            # Only the first declaration on a line counts
+            if classes and classes[-1].line_start == line_no:
+                continue
+
+            base = match.group(2)
+            classes.append(
+                ClassInfo(
+                    name=match.group(1),
+                    line_start=line_no,
+                    line_end=line_no,
+                    bases=[base] if base else [],
+                    methods=[],
                 )
+            )
 
         return classes
 
-    def _extract_imports_js(self, source: str) -> List[str]:
+    def _extract_imports_js(self, lines: List[str]) -> List[str]:
         """Extract import statements
 
         Args:
-            source: Source code
+            lines: Source lines
 
         Returns:
-            List of import statements
+            List of distinct import statements, in first-seen order
         """
-        imports = []
+        imports: Dict[str, None] = {}
+        match = _IMPORT_RE.match
 
-        patterns = [
-            r'import\s+.*?\s+from\s+[\'"][^\'"]+[\'"];?',
-            r'import\s+[\'"][^\'"]+[\'"];?',
-            r'require\([\'"][^\'"]+[\'"]\);?',
-        ]
-
-        for line in source.split("\n"):
+        for line in lines:
             line = line.strip()
-            for pattern in patterns:
-                if re.match(pattern, line):
-                    imports.append(line)
-                    break
+            if line.startswith(_IMPORT_PREFIXES) and match(line):
+                imports[line] = None
 
-        return imports
+        return list(imports)
 
-    def _calculate_complexity_js(self, source: str) -> ComplexityMetrics:
+    def _calculate_complexity_js(
+        self, source: str, lines: List[str]
+    ) -> ComplexityMetrics:
         """Calculate complexity metrics
 
         Args:
             source: Source code
+            lines: source split into lines
 
         Returns:
             ComplexityMetrics object
         """
-        lines = source.split("\n")
-        line_count = len(lines)
-
-        # Count code lines (non-blank, non-comment)
+        # Code lines and cyclomatic complexity in one pass
         code_lines = 0
-        for line in lines:
-            stripped = line.strip()
-            if stripped and not stripped.startswith("//") and not stripped.startswith("/*"):
-                code_lines += 1
-
-        # Calculate cyclomatic complexity
         complexity_score = 1  # Base complexity
-        control_flow = ["if", "else", "for", "while", "case", "catch", "switch", "&&", "||"]
+        control_search = _CONTROL_RE.search
 
         for line in lines:
             stripped = line.strip()
-            for keyword in control_flow:
-                if keyword in stripped:
-                    complexity_score += 1
-                    break
 
-        # Count functions and classes
-        function_count = len(re.findall(r'function\s+\w+', source))
-        function_count += len(re.findall(r'\w+\s*:\s*function', source))
-        function_count += len(re.findall(r'\w+\s*\([^)]*\)\s*{', source))
-        class_count = len(re.findall(r'class\s+\w+', source))
+            # Count code lines (non-blank, non-comment)
+            if stripped and not stripped.startswith(_COMMENT_PREFIXES):
+                code_lines += 1
+
+            if control_search(stripped):
+                complexity_score += 1
+
+        # Count functions and classes without building lists of matches
+        function_count = sum(1 for _ in _FUNC_KEYWORD_RE.finditer(source))
+        function_count += sum(
+            _count_word_prefixed(tail, source) for tail in _WORD_PREFIXED_TAILS
+        )
+        class_count = sum(1 for _ in _CLASS_COUNT_RE.finditer(source))
 
         # Find max parameters
         max_params = 0
-        param_matches = re.findall(r'\(([^)]*)\)', source)
-        for params in param_matches:
+        for match in _PARAM_RE.finditer(source):
+            params = match.group(1)
+            # At most commas + 1 parameters, so most lists can't beat the max
+            if params.count(",") < max_params:
+                continue
             param_count = len([p for p in params.split(",") if p.strip()])
-            max_params = max(max_params, param_count)
-
-        # Calculate max nesting depth
-        max_nesting = self._calculate_nesting_depth(source)
+            if param_count > max_params:
+                max_params = param_count
 
         return ComplexityMetrics(
-            line_count=line_count,
+            line_count=len(lines),
             code_lines=code_lines,
-            nesting_depth=max_nesting,
+            nesting_depth=self._calculate_nesting_depth(source),
             complexity_score=complexity_score,
             function_count=function_count,
             class_count=class_count,
@@ -257,7 +373,10 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         )
 
     def _calculate_nesting_depth(self, source: str) -> int:
-        """Calculate maximum nesting depth
+        """Calculate maximum brace nesting depth
+
+        Comments and string literals are removed first, then only the
+        braces that remain are walked.
 
         Args:
             source: Source code
@@ -265,21 +384,17 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         Returns:
             Maximum nesting depth
         """
-        max_depth = 0
-        current_depth = 0
-
-        for line in source.split("\n"):
-            stripped = line.strip()
-
-            # Count opening brackets/keywords
-            if any(kw in stripped for kw in ["if", "for", "while", "function", "=>", "class", "switch", "try", "catch"]):
-                if "{" in stripped or ":" in stripped:
-                    current_depth += 1
-                    max_depth = max(max_depth, current_depth)
+        braces = _NON_BRACE_RE.sub("", _NON_CODE_RE.sub("", source))
 
-            # Count closing brackets
-            current_depth -= stripped.count("}")
-            current_depth = max(0, current_depth)
+        max_depth = 0
+        depth = 0
+        for brace in braces:
+            if brace == "{":
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            elif depth:
+                depth -= 1
 
         return max_depth
 
@@ -292,14 +407,12 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         Returns:
             True if file exports something
         """
-        return bool(
-            re.search(r'export\s+(default\s+)?', source)
-            or re.search(r'module\.exports', source)
-        )
+        return _EXPORT_RE.search(source) is not None
 
     def _determine_actions(
         self,
         file_path: str,
+        path: Path,
         context: Dict[str, Any],
         complexity: ComplexityMetrics,
     ) -> List[Dict[str, Any]]:
@@ -307,6 +420,7 @@ class JavaScriptAnalyzer(BaseAnalyzer):
 
         Args:
             file_path: Path to the file
+            path: file_path as a Path
             context: Analysis context
             complexity: Complexity metrics
 
@@ -315,7 +429,6 @@ class JavaScriptAnalyzer(BaseAnalyzer):
         """
         actions = []
         commit_message = context.get("commit_message", "").lower()
-        path = Path(file_path)
 
         # Check for component additions
         if "component" in path.parts or "components" in path.parts:
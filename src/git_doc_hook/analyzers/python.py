@@ -4,9 +4,12 @@ Provides detailed analysis of Python code including complexity,
 function detection, and dependency extraction.
 """
 import ast
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from git_doc_hook.analyzers._cache import cached_analysis
 from git_doc_hook.analyzers.base import (
     BaseAnalyzer,
     AnalysisResult,
@@ -16,10 +19,242 @@ from git_doc_hook.analyzers.base import (
 )
 
 
+@lru_cache(maxsize=32)
+def _parse(
+    file_path: str, mtime_ns: int, size: int
+) -> Tuple[str, Optional[ast.Module]]:
+    """Read and parse a file, memoized on its path, mtime and size
+
+    The returned tree is shared between callers and must not be modified.
+
+    Args:
+        file_path: Path to the Python file
+        mtime_ns: Modification time of the file, in nanoseconds
+        size: Size of the file in bytes
+
+    Returns:
+        Tuple of (source, tree), where tree is None on a syntax error
+    """
+    # Undecodable bytes are replaced rather than failing the file
+    source = Path(file_path).read_bytes().decode("utf-8", "replace")
+    try:
+        return source, ast.parse(source, filename=file_path)
+    except (SyntaxError, ValueError):  # ValueError: null bytes before 3.12
+        return source, None
+
+
+def _load(file_path: str) -> Tuple[str, Optional[ast.Module]]:
+    """Get the source and tree of a file, reparsing only if it changed"""
+    st = os.stat(file_path)
+    return _parse(file_path, st.st_mtime_ns, st.st_size)
+
+
+def _dotted_name(node: ast.Attribute) -> Optional[str]:
+    """Build "a.b.c" from an attribute chain without touching the source
+
+    Args:
+        node: Attribute node
+
+    Returns:
+        Dotted name, or None if the chain is not rooted at a plain name
+    """
+    parts = [node.attr]
+    value = node.value
+    while isinstance(value, ast.Attribute):
+        parts.append(value.attr)
+        value = value.value
+    if not isinstance(value, ast.Name):
+        return None
+    parts.append(value.id)
+    return ".".join(reversed(parts))
+
+
+def _node_classes(base: type) -> List[type]:
+    """List a node class and all of its subclasses"""
+    classes = [base]
+    for sub in base.__subclasses__():
+        classes.extend(_node_classes(sub))
+    return classes
+
+
+# Node types without child statements or expressions: names, constants,
+# contexts and operators. They make up much of a tree but never contain
+# anything _PyStatsVisitor collects, so it does not descend into them.
+_LEAF_NODES = frozenset(
+    [ast.Name, ast.Constant, ast.alias, ast.Load, ast.Store, ast.Del]
+    + [
+        cls
+        for base in (ast.operator, ast.unaryop, ast.cmpop, ast.boolop)
+        for cls in base.__subclasses__()
+    ]
+)
+
+# Node types _PyStatsVisitor descends into. Checking membership by exact
+# type is a single hash lookup, unlike isinstance() against AST classes.
+_INNER_NODES = frozenset(_node_classes(ast.AST)) - _LEAF_NODES
+
+_FUNCTION_NODES = frozenset([ast.FunctionDef, ast.AsyncFunctionDef])
+
+
+class _PyStatsVisitor(ast.NodeVisitor):
+    """Collect functions, classes, imports and complexity in one tree pass
+
+    Attributes:
+        functions: Function definitions, in source order
+        classes: Class definitions, in source order
+        imports: Import statements
+        complexity_score: Cyclomatic complexity estimate
+        function_count: Number of function definitions
+        class_count: Number of class definitions
+        max_params: Maximum parameter count of any function
+        max_depth: Maximum nesting depth of control-flow blocks
+    """
+
+    # Node class -> visitor function, shared by all instances
+    _dispatch: Dict[type, Callable[["_PyStatsVisitor", ast.AST], None]] = {}
+
+    def __init__(self, source: str):
+        self.source = source
+        self.functions: List[FunctionInfo] = []
+        self.classes: List[ClassInfo] = []
+        self.imports: List[str] = []
+        self.complexity_score = 1  # Base complexity
+        self.function_count = 0
+        self.class_count = 0
+        self.max_params = 0
+        self.depth = 0
+        self.max_depth = 0
+
+    def visit(self, node: ast.AST) -> None:
+        """Visit a node, dispatching through a per-class method table
+
+        Replaces NodeVisitor's per-node "visit_" + class name lookup.
+        """
+        try:
+            method = self._dispatch[node.__class__]
+        except KeyError:
+            method = getattr(
+                _PyStatsVisitor, "visit_" + node.__class__.__name__, _PyStatsVisitor.generic_visit
+            )
+            self._dispatch[node.__class__] = method
+        method(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Visit child nodes, skipping leaves that hold nothing to collect"""
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if value.__class__ is list:
+                for item in value:
+                    if item.__class__ in _INNER_NODES:
+                        visit(item)
+            elif value.__class__ in _INNER_NODES:
+                visit(value)
+
+    def _visit_nested(self, node: ast.AST) -> None:
+        """Visit a block that adds a nesting level"""
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+        self.generic_visit(node)
+        self.depth -= 1
+
+    def _visit_branch(self, node: ast.AST) -> None:
+        """Visit a node that adds a decision point"""
+        self.complexity_score += 1
+        self.generic_visit(node)
+
+    def visit_If(self, node: ast.AST) -> None:
+        self.complexity_score += 1
+        self._visit_nested(node)
+
+    visit_For = visit_While = visit_If
+    visit_With = visit_Try = _visit_nested
+    visit_ExceptHandler = visit_BoolOp = visit_Compare = _visit_branch
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        decorators = [d.id if isinstance(d, ast.Name) else str(d) for d in node.decorator_list]
+        parameters = [arg.arg for arg in node.args.args]
+
+        self.functions.append(
+            FunctionInfo(
+                name=node.name,
+                line_start=node.lineno,
+                line_end=node.end_lineno or node.lineno,
+                parameters=parameters,
+                decorators=decorators,
+                is_method=False,  # Methods are listed separately on their class
+                is_async=False,
+            )
+        )
+        self.function_count += 1
+        if len(parameters) > self.max_params:
+            self.max_params = len(parameters)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        # Get base classes
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                bases.append(_dotted_name(base) or ast.get_source_segment(self.source, base) or "")
+
+        # Get methods
+        methods = []
+        for item in node.body:
+            if item.__class__ in _FUNCTION_NODES:
+                decorators = [
+                    d.id if isinstance(d, ast.Name) else str(d)
+                    for d in item.decorator_list
+                ]
+                parameters = [arg.arg for arg in item.args.args]
+
+                methods.append(
+                    FunctionInfo(
+                        name=item.name,
+                        line_start=item.lineno,
+                        line_end=item.end_lineno or item.lineno,
+                        parameters=parameters,
+                        decorators=decorators,
+                        is_method=True,
+                        is_async=item.__class__ is ast.AsyncFunctionDef,
+                    )
+                )
+
+        self.classes.append(
+            ClassInfo(
+                name=node.name,
+                line_start=node.lineno,
+                line_end=node.end_lineno or node.lineno,
+                bases=bases,
+                methods=methods,
+            )
+        )
+        self.class_count += 1
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(f"import {alias.name}")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        names = [alias.name for alias in node.names]
+        self.imports.append(f"from {module} import {', '.join(names)}")
+
+
 class PythonAnalyzer(BaseAnalyzer):
     """Analyzer for Python code using AST parsing"""
 
     extensions = [".py"]
+    interpreters = [b"python"]
+    skip_vendored = True
+    branching_keywords = (
+        "if", "elif", "else", "for", "while", "case",
+        "try", "except", "finally", "and", "or",
+    )
 
     @property
     def language(self) -> str:
@@ -29,6 +264,7 @@ class PythonAnalyzer(BaseAnalyzer):
         """Check if file is a Python file"""
         return Path(file_path).suffix.lower() in self.extensions
 
+    @cached_analysis
     def analyze(
         self, file_path: str, context: Optional[Dict[str, Any]] = None
     ) -> AnalysisResult:
@@ -44,13 +280,14 @@ class PythonAnalyzer(BaseAnalyzer):
         path = Path(file_path)
 
         try:
-            source = path.read_text()
-        except (IOError, UnicodeDecodeError):
+            st = os.stat(file_path)
+            if self.should_skip(path, st.st_size):
+                return self._empty_result(file_path)
+            source, tree = _parse(file_path, st.st_mtime_ns, st.st_size)
+        except OSError:
             return self._empty_result(file_path)
 
-        try:
-            tree = ast.parse(source, filename=str(path))
-        except SyntaxError:
+        if tree is None:
             # File has syntax errors, return basic analysis
             complexity = self.calculate_complexity(source)
             return AnalysisResult(
@@ -61,16 +298,18 @@ class PythonAnalyzer(BaseAnalyzer):
                 complexity=complexity,
             )
 
-        # Extract information
-        functions = self._extract_functions(tree)
-        classes = self._extract_classes(tree, source)
-        imports = self._extract_imports_ast(tree)
-        complexity = self._calculate_complexity_ast(tree, source)
+        # Extract information in a single pass over the tree
+        stats = _PyStatsVisitor(source)
+        stats.visit(tree)
+        functions = stats.functions
+        classes = stats.classes
+        imports = list(dict.fromkeys(stats.imports))  # Drop repeats, keep order
+        complexity = self._calculate_complexity_ast(stats, source)
 
         # Determine layers and actions
         context = context or {}
         layers = self.detect_layers(file_path, context)
-        actions = self._determine_actions(file_path, context, complexity)
+        actions = self._determine_actions(file_path, path, context, complexity)
 
         return AnalysisResult(
             file_path=file_path,
@@ -82,7 +321,7 @@ class PythonAnalyzer(BaseAnalyzer):
             classes=classes,
             imports=imports,
             metadata={
-                "file_type": self.detect_file_type(file_path),
+                "file_type": self.detect_file_type(path),
                 "has_classes": len(classes) > 0,
                 "has_tests": any("test" in f.name.lower() for f in functions),
             },
@@ -97,128 +336,19 @@ class PythonAnalyzer(BaseAnalyzer):
             actions=[],
         )
 
-    def _extract_functions(self, tree: ast.AST) -> List[FunctionInfo]:
-        """Extract all function definitions
-
-        Args:
-            tree: AST tree
-
-        Returns:
-            List of FunctionInfo objects
-        """
-        functions = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                decorators = [d.id if isinstance(d, ast.Name) else str(d) for d in node.decorator_list]
-                parameters = [arg.arg for arg in node.args.args]
-
-                functions.append(
-                    FunctionInfo(
-                        name=node.name,
-                        line_start=node.lineno,
-                        line_end=node.end_lineno or node.lineno,
-                        parameters=parameters,
-                        decorators=decorators,
-                        is_method=False,  # Will be updated by class extraction
-                        is_async=isinstance(node, ast.AsyncFunctionDef),
-                    )
-                )
-
-        return functions
-
-    def _extract_classes(self, tree: ast.AST, source: str) -> List[ClassInfo]:
-        """Extract all class definitions
-
-        Args:
-            tree: AST tree
-            source: Source code
-
-        Returns:
-            List of ClassInfo objects
-        """
-        classes = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # Get base classes
-                bases = []
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        bases.append(base.id)
-                    elif isinstance(base, ast.Attribute):
-                        bases.append(ast.get_source_segment(source, base) or "")
-
-                # Get methods
-                methods = []
-                for item in node.body:
-                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        decorators = [
-                            d.id if isinstance(d, ast.Name) else str(d)
-                            for d in item.decorator_list
-                        ]
-                        parameters = [arg.arg for arg in item.args.args]
-
-                        methods.append(
-                            FunctionInfo(
-                                name=item.name,
-                                line_start=item.lineno,
-                                line_end=item.end_lineno or item.lineno,
-                                parameters=parameters,
-                                decorators=decorators,
-                                is_method=True,
-                                is_async=isinstance(item, ast.AsyncFunctionDef),
-                            )
-                        )
-
-                classes.append(
-                    ClassInfo(
-                        name=node.name,
-                        line_start=node.lineno,
-                        line_end=node.end_lineno or node.lineno,
-                        bases=bases,
-                        methods=methods,
-                    )
-                )
-
-        return classes
-
-    def _extract_imports_ast(self, tree: ast.AST) -> List[str]:
-        """Extract import statements using AST
-
-        Args:
-            tree: AST tree
-
-        Returns:
-            List of import statements
-        """
-        imports = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(f"import {alias.name}")
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                names = [alias.name for alias in node.names]
-                imports.append(f"from {module} import {', '.join(names)}")
-
-        return imports
-
     def _calculate_complexity_ast(
-        self, tree: ast.AST, source: str
+        self, stats: _PyStatsVisitor, source: str
     ) -> ComplexityMetrics:
-        """Calculate complexity using AST
+        """Calculate complexity from tree statistics and source lines
 
         Args:
-            tree: AST tree
+            stats: Visitor that has already walked the AST
             source: Source code
 
         Returns:
             ComplexityMetrics object
         """
         lines = source.split("\n")
-        line_count = len(lines)
 
         # Count code lines (non-blank, non-comment)
         code_lines = 0
@@ -227,66 +357,20 @@ class PythonAnalyzer(BaseAnalyzer):
             if stripped and not stripped.startswith("#"):
                 code_lines += 1
 
-        # Calculate cyclomatic complexity
-        complexity_score = 1  # Base complexity
-
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                complexity_score += 1
-            elif isinstance(node, (ast.BoolOp, ast.Compare)):
-                complexity_score += 1
-
-        # Count functions and classes
-        function_count = sum(1 for n in ast.walk(tree) if isinstance(n, ast.FunctionDef))
-        class_count = sum(1 for n in ast.walk(tree) if isinstance(n, ast.ClassDef))
-
-        # Find max parameters
-        max_params = 0
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                param_count = len(node.args.args)
-                max_params = max(max_params, param_count)
-
-        # Calculate max nesting depth
-        max_nesting = self._calculate_nesting_depth(tree)
-
         return ComplexityMetrics(
-            line_count=line_count,
+            line_count=len(lines),
             code_lines=code_lines,
-            nesting_depth=max_nesting,
-            complexity_score=complexity_score,
-            function_count=function_count,
-            class_count=class_count,
-            param_count=max_params,
+            nesting_depth=stats.max_depth,
+            complexity_score=stats.complexity_score,
+            function_count=stats.function_count,
+            class_count=stats.class_count,
+            param_count=stats.max_params,
         )
 
-    def _calculate_nesting_depth(self, tree: ast.AST) -> int:
-        """Calculate maximum nesting depth
-
-        Args:
-            tree: AST tree
-
-        Returns:
-            Maximum nesting depth
-        """
-        max_depth = 0
-
-        def count_nesting(node, depth=0):
-            nonlocal max_depth
-            max_depth = max(max_depth, depth)
-
-            for child in ast.iter_child_nodes(node):
-                if isinstance(child, (ast.If, ast.While, ast.For, ast.With, ast.Try)):
-                    count_nesting(child, depth + 1)
-                else:
-                    count_nesting(child, depth)
-
-        count_nesting(tree)
-        return max_depth
-
     def _determine_actions(
         self,
         file_path: str,
+        path: Path,
         context: Dict[str, Any],
         complexity: ComplexityMetrics,
     ) -> List[Dict[str, Any]]:
@@ -294,6 +378,7 @@ class PythonAnalyzer(BaseAnalyzer):
 
         Args:
             file_path: Path to the file
+            path: file_path as a Path
             context: Analysis context
             complexity: Complexity metrics
 
@@ -302,7 +387,6 @@ class PythonAnalyzer(BaseAnalyzer):
         """
         actions = []
         commit_message = context.get("commit_message", "").lower()
-        path = Path(file_path)
 
         # Check if this is a service file
         if "service" in path.parts or "services" in path.parts:
@@ -341,9 +425,10 @@ class PythonAnalyzer(BaseAnalyzer):
             FunctionInfo or None
         """
         try:
-            source = Path(file_path).read_text()
-            tree = ast.parse(source, filename=file_path)
-        except (IOError, SyntaxError):
+            _, tree = _load(file_path)
+        except OSError:
+            return None
+        if tree is None:
             return None
 
         for node in ast.walk(tree):
@@ -2,28 +2,20 @@
 
 Provides commands for init, status, update, clear, and memos management.
 """
-import json
+import os
+import re
 import sys
-import time
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import click
 
-# Try to import YAML
-try:
-    import yaml
-except ImportError:
-    print("Error: pyyaml is required. Install with: pip install pyyaml")
-    sys.exit(1)
+# Core modules are imported inside the commands that use them, so that
+# --help, --version and the hooks only load what they need
 
-from git_doc_hook.core.config import Config
-from git_doc_hook.core.git import GitManager, GitError
-from git_doc_hook.core.state import StateManager
-from git_doc_hook.memos.client import MemOSRecord
-from git_doc_hook.analyzers import get_analyzer
-from git_doc_hook.template import create_renderer
-from git_doc_hook.updaters import DocumentUpdater, ConfigFileUpdater, extract_code_patterns
+# --project must name an existing directory; click reports it otherwise
+_PROJECT_DIR = click.Path(exists=True, file_okay=False)
 
 
 @click.group()
@@ -37,6 +29,94 @@ def cli():
     pass
 
 
+# Layers that update knows how to process, in the order it processes them:
+# the documents first, then the MemOS record describing the change
+_LAYER_ORDER = ("traditional", "config", "memo")
+_ALL_LAYERS = frozenset(_LAYER_ORDER)
+
+
+class _Echoer:
+    """Collects output lines and writes them with a single echo
+
+    Used as a context manager, the lines are written on exit, including
+    when the command exits early or fails. Errors for stderr are not
+    collected.
+    """
+
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def __call__(self, message: str = "") -> None:
+        """Add a line of output"""
+        self._lines.append(message)
+
+    def flush(self) -> None:
+        """Write the collected lines"""
+        if self._lines:
+            click.echo("\n".join(self._lines))
+            self._lines = []
+
+    def __enter__(self) -> "_Echoer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+
+def _resolve_project(project: str) -> Path:
+    """Resolve the --project option to an absolute path
+
+    The path is normalized lexically, without resolve() and its
+    per-component syscalls; the working directory is already free of
+    symlinks. Only paths with ".." are resolved, since "link/.." is not
+    the directory containing "link" when "link" is a symlink.
+
+    Args:
+        project: Path to project directory
+
+    Returns:
+        Absolute project path
+    """
+    if project == ".":
+        return Path(os.getcwd())
+    path = Path(project)
+    if ".." in path.parts:
+        return path.resolve()
+    return Path(os.path.normpath(os.path.join(os.getcwd(), project)))
+
+
+_PRE_PUSH_HOOK = """#!/bin/bash
+# git-doc-hook pre-push
+
+# Run git-doc-hook check
+{command} check-pre-push "$@"
+"""
+
+_POST_COMMIT_HOOK = """#!/bin/bash
+# git-doc-hook post-commit
+
+# Check if documentation update is needed
+{command} check-post-commit
+"""
+
+
+def _install_hook(path: Path, content: str) -> None:
+    """Write an executable Git hook script
+
+    The file is created executable and its mode set through the open
+    descriptor, so it is never left non-executable between two calls.
+
+    Args:
+        path: Path of the hook file
+        content: Hook script
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    with os.fdopen(fd, "wb") as f:
+        # Also covers the umask and a replaced hook's old mode
+        os.fchmod(fd, 0o755)
+        f.write(content.encode("utf-8"))
+
+
 def _find_git_doc_hook_command() -> str:
     """Find the full path to git-doc-hook executable.
 
@@ -67,7 +147,7 @@ def _find_git_doc_hook_command() -> str:
 
 @cli.command()
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 @click.option(
     "--force", "-f", is_flag=True, help="Overwrite existing configuration"
@@ -77,7 +157,9 @@ def init(project: str, force: bool):
 
     Creates default configuration and installs Git hooks.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core.config import Config
+
+    project_path = _resolve_project(project)
 
     # Find the full path to git-doc-hook for hooks
     gdh_command = _find_git_doc_hook_command()
@@ -86,73 +168,61 @@ def init(project: str, force: bool):
         click.echo(f"Error: Not a Git repository: {project_path}", err=True)
         sys.exit(1)
 
-    config = Config(str(project_path))
-    config_dir = project_path / ".git-doc-hook"
+    # Output is written in one go when the command finishes
+    with _Echoer() as echo:
+        config = Config(str(project_path))
+        config_dir = project_path / ".git-doc-hook"
 
-    # Create config directory
-    config_dir.mkdir(exist_ok=True)
-    click.echo(f"Created directory: {config_dir}")
+        # Create config directory
+        config_dir.mkdir(exist_ok=True)
+        echo(f"Created directory: {config_dir}")
 
-    # Check for existing config
-    if config.config_file.exists() and not force:
-        click.echo(f"Configuration already exists: {config.config_file}")
-        click.echo("Use --force to overwrite")
-        sys.exit(1)
+        # Check for existing config
+        if config.config_exists and not force:
+            echo(f"Configuration already exists: {config.config_file}")
+            echo("Use --force to overwrite")
+            sys.exit(1)
 
-    # Create default config
-    config.save()
-    click.echo(f"Created configuration: {config.config_file}")
+        # Create default config
+        config.save()
+        echo(f"Created configuration: {config.config_file}")
 
-    # Install Git hooks
-    hooks_dir = project_path / ".git" / "hooks"
-    hooks_installed = []
+        # Install Git hooks
+        hooks_dir = project_path / ".git" / "hooks"
+        hooks_installed = []
 
-    # Pre-push hook
-    pre_push = hooks_dir / "pre-push"
-    if not pre_push.exists() or force:
-        pre_push_content = f"""#!/bin/bash
-# git-doc-hook pre-push
+        # Pre-push hook
+        pre_push = hooks_dir / "pre-push"
+        if not pre_push.exists() or force:
+            _install_hook(pre_push, _PRE_PUSH_HOOK.format(command=gdh_command))
+            hooks_installed.append("pre-push")
 
-# Run git-doc-hook check
-{gdh_command} check-pre-push "$@"
-"""
-        pre_push.write_text(pre_push_content)
-        pre_push.chmod(0o755)
-        hooks_installed.append("pre-push")
-
-    # Post-commit hook
-    post_commit = hooks_dir / "post-commit"
-    if not post_commit.exists() or force:
-        post_commit_content = f"""#!/bin/bash
-# git-doc-hook post-commit
+        # Post-commit hook
+        post_commit = hooks_dir / "post-commit"
+        if not post_commit.exists() or force:
+            _install_hook(post_commit, _POST_COMMIT_HOOK.format(command=gdh_command))
+            hooks_installed.append("post-commit")
 
-# Check if documentation update is needed
-{gdh_command} check-post-commit
-"""
-        post_commit.write_text(post_commit_content)
-        post_commit.chmod(0o755)
-        hooks_installed.append("post-commit")
+        if hooks_installed:
+            echo(f"Installed Git hooks: {', '.join(hooks_installed)}")
 
-    if hooks_installed:
-        click.echo(f"Installed Git hooks: {', '.join(hooks_installed)}")
+        # Check MemOS configuration
+        if config.memos_enabled:
+            echo(f"✓ MemOS integration enabled")
+            echo("  Records will be written to state file for Claude Code to sync")
 
-    # Check MemOS configuration
-    if config.memos_enabled:
-        click.echo(f"✓ MemOS integration enabled")
-        click.echo("  Records will be written to state file for Claude Code to sync")
-
-    click.echo("\n✓ git-doc-hook initialized successfully!")
-    click.echo("\nNext steps:")
-    click.echo("  1. Review configuration: .git-doc-hook.yml")
-    click.echo("  2. Commit and push normally")
-    click.echo("  3. If prompted, run: git-doc-hook update <layers>")
-    if config.memos_enabled:
-        click.echo("  4. For MemOS sync: Use Claude Code's /memos-sync command")
+        echo("\n✓ git-doc-hook initialized successfully!")
+        echo("\nNext steps:")
+        echo("  1. Review configuration: .git-doc-hook.yml")
+        echo("  2. Commit and push normally")
+        echo("  3. If prompted, run: git-doc-hook update <layers>")
+        if config.memos_enabled:
+            echo("  4. For MemOS sync: Use Claude Code's /memos-sync command")
 
 
 @cli.command()
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 @click.option(
     "--json", "output_json", is_flag=True, help="Output as JSON"
@@ -162,35 +232,33 @@ def status(project: str, output_json: bool):
 
     Displays any pending documentation updates detected by Git hooks.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
     state = StateManager(str(project_path))
 
     if output_json:
-        pending = state.get_pending()
-        result = {
-            "has_pending": pending is not None,
-            "pending": pending.to_dict() if pending else None,
-        }
-        click.echo(json.dumps(result, indent=2))
+        state.write_pending_json(sys.stdout)
         return
 
     if not state.is_pending():
         click.echo("No pending documentation updates")
         return
 
-    click.echo(state.show_summary())
+    with _Echoer() as echo:
+        echo(state.show_summary())
 
-    # Show MemOS pending records
-    memos_records = state.get_pending_memos_records()
-    if memos_records:
-        click.echo(f"\n⚠ MemOS: {len(memos_records)} record(s) pending sync")
-        click.echo("   Run Claude Code's /memos-sync to sync these records")
+        # Show MemOS pending records
+        memos_records = state.get_pending_memos_records()
+        if memos_records:
+            echo(f"\n⚠ MemOS: {len(memos_records)} record(s) pending sync")
+            echo("   Run Claude Code's /memos-sync to sync these records")
 
 
 @cli.command()
 @click.argument("layers")
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 @click.option(
     "--commit", "-c", is_flag=True, help="Commit changes after update"
@@ -202,19 +270,23 @@ def update(layers: str, project: str, commit: bool):
 
     Example: git-doc-hook update traditional,config
     """
-    project_path = Path(project).resolve()
-    state = StateManager(str(project_path))
+    from git_doc_hook.core.config import Config
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
+    # One Config is shared by the state manager and every layer below
+    config = Config(str(project_path))
+    state = StateManager(str(project_path), config)
 
     if not state.is_pending():
         click.echo("No pending updates to process")
         return
 
     pending = state.get_pending()
-    layer_list = [l.strip() for l in layers.split(",")]
+    requested = frozenset(l.strip() for l in layers.split(","))
 
     # Validate layers
-    valid_layers = set(pending.layers)
-    requested = set(layer_list)
+    valid_layers = _ALL_LAYERS & pending.layers
     invalid = requested - valid_layers
 
     if invalid:
@@ -222,30 +294,31 @@ def update(layers: str, project: str, commit: bool):
         click.echo(f"Valid layers: {', '.join(sorted(valid_layers))}")
         sys.exit(1)
 
-    click.echo(f"Updating layers: {', '.join(sorted(requested))}")
+    requested_order = [layer for layer in _LAYER_ORDER if layer in requested]
+    click.echo(f"Updating layers: {', '.join(requested_order)}")
     click.echo(f"Reason: {pending.reason}")
 
     # Process each layer
     updated = []
 
-    for layer in requested:
+    for layer in requested_order:
         if layer == "traditional":
-            if _update_traditional_docs(project_path):
+            if _update_traditional_docs(project_path, config, pending):
                 updated.append("traditional")
 
         elif layer == "config":
-            if _update_config_rules(project_path):
+            if _update_config_rules(project_path, config, pending):
                 updated.append("config")
 
         elif layer == "memo":
-            if _sync_to_memos(project_path, pending):
+            if _sync_to_memos(project_path, pending, config, state):
                 updated.append("memo")
 
     if updated:
         click.echo(f"\n✓ Updated: {', '.join(updated)}")
 
         # Update state
-        remaining = valid_layers - set(updated)
+        remaining = pending.layers.difference(updated)
         if remaining:
             # Still have pending layers
             state.set_pending(
@@ -254,6 +327,8 @@ def update(layers: str, project: str, commit: bool):
                 triggered_by=pending.triggered_by,
                 files=pending.files,
                 commit_message=pending.commit_message,
+                matched_rules=pending.matched_rules,
+                rules_digest=pending.rules_digest,
             )
             click.echo(f"\n⚠ Remaining: {', '.join(sorted(remaining))}")
         else:
@@ -263,26 +338,27 @@ def update(layers: str, project: str, commit: bool):
 
         # Commit if requested
         if commit:
-            config = Config(str(project_path))
             message = config.get("commit.message_template", "docs: auto-update").format(
                 layers=", ".join(updated),
                 reason=pending.reason,
             )
-            _git_commit(project_path, message)
+            _git_commit(project_path, message, config.get("commit.stage_untracked", True))
     else:
         click.echo("\nNo changes made")
 
 
 @cli.command()
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 def clear(project: str):
     """Clear pending update state
 
     Removes the pending update flag without making changes.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
     state = StateManager(str(project_path))
 
     if not state.is_pending():
@@ -299,7 +375,7 @@ def clear(project: str):
 
 @cli.command()
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 def memos_sync(project: str):
     """Show MemOS records pending sync
@@ -307,7 +383,9 @@ def memos_sync(project: str):
     Displays records waiting to be synced to MemOS by Claude Code.
     Actual sync is performed by Claude Code using MCP tools.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
     state = StateManager(str(project_path))
     records = state.get_pending_memos_records()
 
@@ -315,18 +393,20 @@ def memos_sync(project: str):
         click.echo("No MemOS records pending sync")
         return
 
-    click.echo(f"MemOS records pending sync: {len(records)}")
-    click.echo("Run Claude Code's /memos-sync to sync these records\n")
+    # One write for the whole list, however many records are pending
+    with _Echoer() as echo:
+        echo(f"MemOS records pending sync: {len(records)}")
+        echo("Run Claude Code's /memos-sync to sync these records\n")
 
-    for i, record in enumerate(records, 1):
-        record_type = record.get("record_type", "unknown")
-        commit_msg = record.get("commit_message", "")[:50]
-        click.echo(f"  {i}. [{record_type}] {commit_msg}...")
+        for i, record in enumerate(records, 1):
+            record_type = record.get("record_type", "unknown")
+            commit_msg = record.get("commit_message", "")[:50]
+            echo(f"  {i}. [{record_type}] {commit_msg}...")
 
 
 @cli.command("check-memos", hidden=True)
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 @click.option(
     "--json", "output_json", is_flag=True, help="Output as JSON"
@@ -336,7 +416,10 @@ def check_memos(project: str, output_json: bool):
 
     Internal command for Claude Code to read pending records.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core._json import dumps
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
     state = StateManager(str(project_path))
     records = state.get_pending_memos_records()
 
@@ -345,7 +428,7 @@ def check_memos(project: str, output_json: bool):
             "count": len(records),
             "records": records,
         }
-        click.echo(json.dumps(result, indent=2))
+        click.echo(dumps(result))
     else:
         click.echo(f"MemOS pending: {len(records)} records")
         for record in records:
@@ -354,7 +437,7 @@ def check_memos(project: str, output_json: bool):
 
 @cli.command("clear-memos", hidden=True)
 @click.option(
-    "--project", "-p", default=".", help="Path to project directory"
+    "--project", "-p", default=".", type=_PROJECT_DIR, help="Path to project directory"
 )
 @click.option(
     "--synced", is_flag=True, help="Only clear synced records"
@@ -364,7 +447,9 @@ def clear_memos(project: str, synced: bool):
 
     Internal command for Claude Code to clear synced records.
     """
-    project_path = Path(project).resolve()
+    from git_doc_hook.core.state import StateManager
+
+    project_path = _resolve_project(project)
     state = StateManager(str(project_path))
     count = state.clear_pending_memos(only_synced=synced)
 
@@ -379,11 +464,25 @@ def check_pre_push(remote: Optional[str], url: Optional[str]):
 
     Checks if push should be blocked for documentation update.
     """
+    _check_pre_push(remote, url)
+
+
+def _check_pre_push(remote: Optional[str] = None, url: Optional[str] = None) -> None:
+    """Check if push should be blocked for documentation update
+
+    Args:
+        remote: Name of the remote being pushed to
+        url: URL of the remote
+    """
+    from git_doc_hook.core.config import Config
+    from git_doc_hook.core.git import GitManager, GitError
+    from git_doc_hook.core.state import StateManager
+
     project = "."
     try:
         git = GitManager(project)
         config = Config(project)
-        state = StateManager(project)
+        state = StateManager(project, config)
 
         # Get diff
         target = remote or "origin/main"
@@ -395,21 +494,25 @@ def check_pre_push(remote: Optional[str], url: Optional[str]):
         # Analyze changes
         layers_to_update = set()
 
-        for commit in diff.commits:
-            msg = commit.message.lower()
-
-            # Check for troubleshooting
-            if any(kw in msg for kw in config.keywords.get("troubleshooting", [])):
-                layers_to_update.add("memo")
-
-            # Check for decisions
-            if any(kw in msg for kw in config.keywords.get("decisions", [])):
-                layers_to_update.add("memo")
-
-        # Check for service changes
-        for file_path in diff.files:
-            for rule in config.get_rules_for_pattern(file_path):
-                layers_to_update.update(rule.get("layers", []))
+        # Check for troubleshooting or decisions
+        memo_re = config.keyword_pattern("troubleshooting", "decisions")
+        if memo_re is not None and any(
+            memo_re.search(commit.message_lower) for commit in diff.commits
+        ):
+            layers_to_update.add("memo")
+
+        # Check for service changes, recording the matches for update
+        rules = config.rules
+        matched_rules = {
+            file_path: indices
+            for file_path in diff.files
+            if (indices := config.get_rule_indices(file_path))
+        }
+        layers_to_update.update(chain.from_iterable(
+            rules[i].get("layers", ())
+            for indices in matched_rules.values()
+            for i in indices
+        ))
 
         if layers_to_update:
             # Set pending state
@@ -419,6 +522,8 @@ def check_pre_push(remote: Optional[str], url: Optional[str]):
                 triggered_by=diff.commits[0].hash if diff.commits else "manual",
                 files=list(diff.files),
                 commit_message=diff.commits[0].message if diff.commits else "",
+                matched_rules=matched_rules,
+                rules_digest=config.rules_digest,
             )
 
             click.echo("\n⚠ Documentation update needed")
@@ -429,21 +534,30 @@ def check_pre_push(remote: Optional[str], url: Optional[str]):
         pass  # Not in git repo or other error
 
 
+# Commit message keywords worth a status reminder, matched anywhere in the
+# message (so "fixes" and "bugfix" count too)
+_POST_COMMIT_RE = re.compile(r"fix|feat|refactor|decision|bug", re.IGNORECASE)
+
+
 @cli.command(hidden=True)
 def check_post_commit():
     """Internal: Called by post-commit hook
 
     Marks commit for potential documentation update.
     """
+    _check_post_commit()
+
+
+def _check_post_commit() -> None:
+    """Mark commit for potential documentation update"""
+    from git_doc_hook.core.git import GitManager, GitError
+
     # Post-commit check - lightweight version
     try:
         git = GitManager(".")
         commit = git.get_head_commit()
 
-        if commit and any(
-            kw in commit.message.lower()
-            for kw in ["fix", "feat", "refactor", "decision", "bug"]
-        ):
+        if commit and _POST_COMMIT_RE.search(commit.message):
             click.echo("ℹ Commit detected. Run 'git-doc-hook status' after push.")
 
     except GitError:
@@ -452,11 +566,13 @@ def check_post_commit():
 
 # Helper functions
 
-def _update_traditional_docs(project_path: Path) -> bool:
+def _update_traditional_docs(project_path: Path, config, pending) -> bool:
     """Update traditional documentation
 
     Args:
         project_path: Path to project
+        config: Project configuration
+        pending: Pending update info
 
     Returns:
         True if updated successfully
@@ -468,14 +584,15 @@ def _update_traditional_docs(project_path: Path) -> bool:
         click.echo("  Warning: Template/updater modules not available")
         return False
 
-    state = StateManager(str(project_path))
-    config = Config(str(project_path))
-    pending = state.get_pending()
-
     if not pending:
         click.echo("  No pending updates to process")
         return False
 
+    # Without changed files only the README fallback below can apply, so
+    # don't build the renderer and context if there is no README either
+    if not pending.files and not (project_path / "README.md").exists():
+        return False
+
     # Create renderer and updater
     renderer = create_renderer(project_path, config)
     updater = DocumentUpdater(
@@ -486,109 +603,190 @@ def _update_traditional_docs(project_path: Path) -> bool:
     # Build template context
     context = renderer.build_context(project_path, pending, config)
 
-    any_updated = False
-
-    # Process each file's rules
-    for file_path in pending.files:
-        matching_rules = config.get_rules_for_pattern(file_path)
+    # Progress lines are written in one go at the end, instead of a
+    # write and flush per updated document
+    with _Echoer() as echo:
+        any_updated = False
+        target_paths: Dict[str, Path] = {}
 
-        for rule in matching_rules:
-            # Only process rules that target traditional docs
+        # Actions of the rules that target traditional docs, by rule index
+        rules = config.rules
+        rule_actions: Dict[int, List[Tuple[Dict[str, Any], Callable[..., Optional[str]]]]] = {}
+        for i, rule in enumerate(rules):
             if "traditional" not in rule.get("layers", []):
                 continue
+            actions = [
+                (action, _ACTION_HANDLERS[action_type])
+                for action in rule.get("actions", [])
+                if action.get("target")
+                and (action_type := str(action.get("action", ""))) in _ACTION_HANDLERS
+            ]
+            if actions:
+                rule_actions[i] = actions
+
+        # Rules matched by the pre-push check are reused unless the rules changed
+        reuse_matches = bool(pending.rules_digest) and pending.rules_digest == config.rules_digest
+
+        # Process each file's rules
+        for file_path in pending.files:
+            if reuse_matches:
+                indices = pending.matched_rules.get(file_path, [])
+            else:
+                indices = config.get_rule_indices(file_path)
+            file_values = None  # Placeholder values, computed on first use
+
+            for i in indices:
+                for action, handler in rule_actions.get(i, ()):
+                    target = action["target"]
+                    target_path = target_paths.get(target)
+                    if target_path is None:
+                        target_path = target_paths[target] = project_path / target
+                    if file_values is None:
+                        file_values = _file_values(file_path)
+
+                    try:
+                        message = handler(
+                            updater, renderer, context, file_values, action, target_path
+                        )
+                    except Exception as e:
+                        echo(f"  ✗ Error updating {target}: {e}")
+                        continue
+
+                    if message:
+                        echo(message)
+                        any_updated = True
+
+        # If no specific rules matched, try default README update
+        if not any_updated:
+            readme = project_path / "README.md"
+            if readme.exists():
+                content = renderer.render_traditional(context)
+                result = updater.append_record(
+                    target_file=readme,
+                    content=f"\n## Recent Changes\n\n{content}\n",
+                )
+                if result.success:
+                    echo(f"  ✓ Updated README.md")
+                    any_updated = True
+
+        return any_updated
+
+
+def _append_table_row(
+    updater, renderer, context: Dict[str, Any], file_values: Dict[str, str],
+    action: Dict[str, Any], target_path: Path,
+) -> Optional[str]:
+    """Handle an append_table_row action
 
-            for action in rule.get("actions", []):
-                target = action.get("target", "")
-                action_type = action.get("action", "")
-                section = action.get("section", "")
+    Args:
+        updater: DocumentUpdater to apply the action with
+        renderer: Template renderer
+        context: Template context
+        file_values: Values of the changed file, from _file_values()
+        action: Action configuration
+        target_path: Path of the action's target document
 
-                if not target:
-                    continue
+    Returns:
+        Progress message if the document was updated, else None
+    """
+    section = action.get("section", "")
 
-                target_path = project_path / target
+    # Build row data from context
+    row_data = _build_row_data(file_values, context, action)
 
-                try:
-                    if action_type == "append_table_row":
-                        # Build row data from context
-                        row_data = _build_row_data(file_path, context, action)
+    # Get table headers from action or use defaults
+    headers = action.get("headers", _get_default_headers(section))
 
-                        # Get table headers from action or use defaults
-                        headers = action.get("headers", _get_default_headers(section))
+    result = updater.append_table_row(
+        target_file=target_path,
+        section=section or "Documentation",
+        row_data=row_data,
+        table_headers=headers,
+    )
+    return f"  ✓ Updated {action['target']}: {section}" if result.success else None
 
-                        result = updater.append_table_row(
-                            target_file=target_path,
-                            section=section or "Documentation",
-                            row_data=row_data,
-                            table_headers=headers,
-                        )
 
-                        if result.success:
-                            click.echo(f"  ✓ Updated {target}: {section}")
-                            any_updated = True
+def _append_record(
+    updater, renderer, context: Dict[str, Any], file_values: Dict[str, str],
+    action: Dict[str, Any], target_path: Path,
+) -> Optional[str]:
+    """Handle an append_record action, see _append_table_row()"""
+    # Generate content from template
+    content = renderer.render_traditional(context)
 
-                    elif action_type == "append_record":
-                        # Generate content from template
-                        content = renderer.render_traditional(context)
+    result = updater.append_record(
+        target_file=target_path,
+        content=content,
+    )
+    return f"  ✓ Appended to {action['target']}" if result.success else None
 
-                        result = updater.append_record(
-                            target_file=target_path,
-                            content=content,
-                        )
 
-                        if result.success:
-                            click.echo(f"  ✓ Appended to {target}")
-                            any_updated = True
+def _update_section(
+    updater, renderer, context: Dict[str, Any], file_values: Dict[str, str],
+    action: Dict[str, Any], target_path: Path,
+) -> Optional[str]:
+    """Handle an update_section action, see _append_table_row()"""
+    section = action.get("section", "")
 
-                    elif action_type == "update_section":
-                        # Generate content from template
-                        content = renderer.render_traditional(context)
+    # Generate content from template
+    content = renderer.render_traditional(context)
 
-                        result = updater.update_section(
-                            target_file=target_path,
-                            section=section or "Updates",
-                            new_content=content,
-                        )
+    result = updater.update_section(
+        target_file=target_path,
+        section=section or "Updates",
+        new_content=content,
+    )
+    if result.success:
+        return f"  ✓ Updated section '{section}' in {action['target']}"
+    return None
 
-                        if result.success:
-                            click.echo(f"  ✓ Updated section '{section}' in {target}")
-                            any_updated = True
 
-                    elif action_type == "prepend_content":
-                        content = renderer.render_traditional(context)
+def _prepend_content(
+    updater, renderer, context: Dict[str, Any], file_values: Dict[str, str],
+    action: Dict[str, Any], target_path: Path,
+) -> Optional[str]:
+    """Handle a prepend_content action, see _append_table_row()"""
+    content = renderer.render_traditional(context)
 
-                        result = updater.prepend_content(
-                            target_file=target_path,
-                            content=content,
-                        )
+    result = updater.prepend_content(
+        target_file=target_path,
+        content=content,
+    )
+    return f"  ✓ Prepended to {action['target']}" if result.success else None
 
-                        if result.success:
-                            click.echo(f"  ✓ Prepended to {target}")
-                            any_updated = True
-
-                except Exception as e:
-                    click.echo(f"  ✗ Error updating {target}: {e}")
-
-    # If no specific rules matched, try default README update
-    if not any_updated:
-        readme = project_path / "README.md"
-        if readme.exists():
-            content = renderer.render_traditional(context)
-            result = updater.append_record(
-                target_file=readme,
-                content=f"\n## Recent Changes\n\n{content}\n",
-            )
-            if result.success:
-                click.echo(f"  ✓ Updated README.md")
-                any_updated = True
 
-    return any_updated
+# Handlers for the actions of traditional docs rules, by action type
+_ACTION_HANDLERS: Dict[str, Callable[..., Optional[str]]] = {
+    "append_table_row": _append_table_row,
+    "append_record": _append_record,
+    "update_section": _update_section,
+    "prepend_content": _prepend_content,
+}
 
 
-def _build_row_data(file_path: str, context: Dict[str, Any], action: Dict[str, Any]) -> Dict[str, str]:
-    """Build row data for table insertion
+def _file_values(file_path: str) -> Dict[str, str]:
+    """Compute the per-file values available to row placeholders
 
     Args:
         file_path: File path being processed
+
+    Returns:
+        Dictionary of placeholder name (file, path, type) to value
+    """
+    return {
+        "file": Path(file_path).name,
+        "path": file_path,
+        "type": _get_file_type(file_path),
+    }
+
+
+def _build_row_data(
+    file_values: Dict[str, str], context: Dict[str, Any], action: Dict[str, Any]
+) -> Dict[str, str]:
+    """Build row data for table insertion
+
+    Args:
+        file_values: Values of the file being processed, from _file_values()
         context: Template context
         action: Action configuration
 
@@ -600,41 +798,56 @@ def _build_row_data(file_path: str, context: Dict[str, Any], action: Dict[str, A
 
     if row_mapping:
         # Use explicit mapping
-        return {col: _extract_value(file_path, context, value_expr)
+        return {col: _extract_value(file_values, context, value_expr)
                 for col, value_expr in row_mapping.items()}
 
     # Default mapping based on section type
-    path = Path(file_path)
     return {
-        "File": path.name,
-        "Path": str(path),
-        "Type": _get_file_type(file_path),
+        "File": file_values["file"],
+        "Path": file_values["path"],
+        "Type": file_values["type"],
     }
 
 
-def _extract_value(file_path: str, context: Dict[str, Any], expr: str) -> str:
+# Row value placeholders, see _file_values()
+_PLACEHOLDER_RE = re.compile(r"\{(file|path|type)\}")
+
+
+def _extract_value(file_values: Dict[str, str], context: Dict[str, Any], expr: str) -> str:
     """Extract a value using an expression
 
     Args:
-        file_path: File path
+        file_values: Values of the file, from _file_values()
         context: Template context
         expr: Expression to evaluate
 
     Returns:
         Extracted value
     """
-    # Simple substitution
-    substitutions = {
-        "{file}": Path(file_path).name,
-        "{path}": file_path,
-        "{type}": _get_file_type(file_path),
-    }
-
-    for key, value in substitutions.items():
-        if key in expr:
-            return expr.replace(key, value)
-
-    return expr
+    # Simple substitution, in a single pass
+    if "{" not in expr:
+        return expr
+    return _PLACEHOLDER_RE.sub(lambda m: file_values[m.group(1)], expr)
+
+
+# File type by (lowercased) name of the file's parent directory
+_TYPE_MAP = {
+    "service": "Service",
+    "model": "Model",
+    "entity": "Model",
+    "controller": "Controller",
+    "util": "Utility",
+    "helper": "Utility",
+    "test": "Test",
+}
+
+# Default table headers by section name; tuples, so they can be shared
+_DEFAULT_HEADERS = ("Name", "Path", "Type")
+_HEADER_MAP = {
+    "Services": _DEFAULT_HEADERS,
+    "Components": _DEFAULT_HEADERS,
+    "Modules": ("File", "Path", "Description"),
+}
 
 
 def _get_file_type(file_path: str) -> str:
@@ -646,60 +859,39 @@ def _get_file_type(file_path: str) -> str:
     Returns:
         File type string
     """
-    path = Path(file_path)
-    parent = path.parent.name.lower()
-
-    type_map = {
-        "service": "Service",
-        "model": "Model",
-        "entity": "Model",
-        "controller": "Controller",
-        "util": "Utility",
-        "helper": "Utility",
-        "test": "Test",
-    }
-
-    return type_map.get(parent, "Module")
+    parent = os.path.basename(os.path.dirname(file_path)).lower()
+    return _TYPE_MAP.get(parent, "Module")
 
 
-def _get_default_headers(section: str) -> List[str]:
+def _get_default_headers(section: str) -> Tuple[str, ...]:
     """Get default table headers for a section
 
     Args:
         section: Section name
 
     Returns:
-        List of headers
+        Tuple of headers
     """
-    header_map = {
-        "Services": ["Name", "Path", "Type"],
-        "Components": ["Name", "Path", "Type"],
-        "Modules": ["File", "Path", "Description"],
-    }
-
-    return header_map.get(section, ["Name", "Path", "Type"])
+    return _HEADER_MAP.get(section, _DEFAULT_HEADERS)
 
 
-def _update_config_rules(project_path: Path) -> bool:
+def _update_config_rules(project_path: Path, config, pending) -> bool:
     """Update config rule documentation
 
     Args:
         project_path: Path to project
+        config: Project configuration
+        pending: Pending update info
 
     Returns:
         True if updated successfully
     """
     try:
-        from template import create_renderer
         from updaters import ConfigFileUpdater, extract_code_patterns
     except ImportError:
         click.echo("  Warning: Template/updater modules not available")
         return False
 
-    state = StateManager(str(project_path))
-    config = Config(str(project_path))
-    pending = state.get_pending()
-
     if not pending:
         return False
 
@@ -715,7 +907,6 @@ def _update_config_rules(project_path: Path) -> bool:
         return False
 
     # Update .clinerules
-    clinerules_path = project_path / ".clinerules"
     result = updater.update_clinerules(project_path, patterns)
 
     if result.success and result.message != "All patterns already documented":
@@ -723,7 +914,6 @@ def _update_config_rules(project_path: Path) -> bool:
         any_updated = True
 
     # Update .cursorrules
-    cursorrules_path = project_path / ".cursorrules"
     result = updater.update_cursorrules(project_path, patterns)
 
     if result.success:
@@ -733,7 +923,7 @@ def _update_config_rules(project_path: Path) -> bool:
     return any_updated
 
 
-def _sync_to_memos(project_path: Path, pending) -> bool:
+def _sync_to_memos(project_path: Path, pending, config, state) -> bool:
     """Create MemOS record and write to state file
 
     Records are written to state for Claude Code to sync via MCP.
@@ -741,12 +931,13 @@ def _sync_to_memos(project_path: Path, pending) -> bool:
     Args:
         project_path: Path to project
         pending: Pending update info
+        config: Project configuration
+        state: State manager for the project
 
     Returns:
         True if record was created successfully
     """
-    config = Config(str(project_path))
-    state = StateManager(str(project_path))
+    from git_doc_hook.memos.client import MemOSRecord
 
     # Generate cube_id from project name
     cube_id = f"{config.project_path.name}-{config.get('state.project_key', config.project_path.name)}"
@@ -765,9 +956,8 @@ def _sync_to_memos(project_path: Path, pending) -> bool:
     record_dict["cube_id"] = cube_id
 
     # Add to pending state
-    state.add_memos_record(record_dict)
+    total_records = state.add_memos_record(record_dict)
 
-    total_records = len(state.get_pending_memos_records())
     click.echo(f"  Created MemOS record: {record.record_type}")
     click.echo(f"  Total pending: {total_records} record(s)")
     click.echo("  Run Claude Code's /memos-sync to sync to MemOS")
@@ -775,39 +965,57 @@ def _sync_to_memos(project_path: Path, pending) -> bool:
     return True
 
 
-def _git_commit(project_path: Path, message: str) -> bool:
+def _git_commit(project_path: Path, message: str, stage_untracked: bool = True) -> bool:
     """Create a git commit
 
     Args:
         project_path: Path to project
         message: Commit message
+        stage_untracked: Also commit untracked files, such as documentation
+                         files the updaters have just created. This needs
+                         a separate "git add -A"; otherwise tracked changes
+                         are committed with a single "git commit -a".
 
     Returns:
         True if successful
     """
-    try:
-        import subprocess
-
-        subprocess.run(
-            ["git", "add", "-A"],
-            cwd=project_path,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "commit", "-m", message],
-            cwd=project_path,
-            check=True,
-            capture_output=True,
-        )
-        click.echo(f"✓ Committed: {message}")
-        return True
-    except subprocess.CalledProcessError:
+    import subprocess
+
+    if stage_untracked:
+        added = subprocess.run(["git", "add", "-A"], cwd=project_path, capture_output=True)
+        if added.returncode != 0:
+            return False
+        commit_args = ["git", "commit", "-m", message]
+    else:
+        commit_args = ["git", "commit", "-a", "-m", message]
+
+    if subprocess.run(commit_args, cwd=project_path, capture_output=True).returncode != 0:
         return False
+    click.echo(f"✓ Committed: {message}")
+    return True
+
+
+# Hook commands run on every push/commit. They take only positional
+# arguments, so main() calls them directly instead of going through Click:
+# command name -> (function, maximum number of arguments)
+_HOOK_COMMANDS = {
+    "check-pre-push": (_check_pre_push, 2),
+    "check-post-commit": (_check_post_commit, 0),
+}
 
 
 def main():
     """Main entry point"""
+    args = sys.argv[1:]
+    hook = _HOOK_COMMANDS.get(args[0]) if args else None
+    if (
+        hook is not None
+        and len(args) - 1 <= hook[1]
+        and not any(arg.startswith("-") for arg in args[1:])
+    ):
+        hook[0](*args[1:])
+        return
+
     cli()
 
 
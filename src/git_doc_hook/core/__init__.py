@@ -1,7 +1,25 @@
 """Core modules for git-doc-hook"""
 
-from .config import Config, glob_match
-from .git import GitManager
-from .state import StateManager
+# Submodules are imported on first access, so that importing one of them
+# (e.g. core.config for a command that never runs git) does not load the rest
+_LAZY_IMPORTS = {
+    "Config": "git_doc_hook.core.config",
+    "glob_match": "git_doc_hook.core.config",
+    "GitManager": "git_doc_hook.core.git",
+    "StateManager": "git_doc_hook.core.state",
+}
 
 __all__ = ["Config", "GitManager", "StateManager", "glob_match"]
+
+
+def __getattr__(name):
+    """Import core classes on first access"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,131 @@
+"""JSON encoding for git-doc-hook output
+
+Uses orjson when it is installed, and the standard library otherwise.
+"""
+import json
+import math
+from typing import Any, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any) -> Union[bytes, None]:
+    """Encode an object with orjson, indented by 2 spaces
+
+    orjson writes NaN and Infinity as null, losing them on a round trip,
+    so objects containing them are left to the standard encoder.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON document as bytes, or None if orjson is unavailable or
+        cannot encode obj faithfully
+    """
+    if orjson is None:
+        return None
+    try:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    except TypeError:
+        return None
+    # Only output containing null can have lost a non-finite float
+    if b"null" in data and _has_non_finite(obj):
+        return None
+    return data
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Check whether an object contains a NaN or infinite float
+
+    Args:
+        obj: Object that orjson encoded
+
+    Returns:
+        True if a float anywhere in obj is not finite
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+def iterencode(obj: Any) -> Iterator[str]:
+    """Encode an object as JSON indented by 2 spaces, in chunks
+
+    orjson output is only used when it is plain ASCII, so the result is
+    the same as json.dumps(obj, indent=2) apart from the spelling of float
+    exponents (1e16 rather than 1e+16). Anything orjson cannot encode, or
+    would encode differently such as NaN and Infinity, goes to the standard
+    encoder.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        Iterator of JSON text chunks
+    """
+    data = _orjson_dumps(obj)
+    if data is not None and data.isascii():
+        yield data.decode("ascii")
+        return
+
+    yield from json.JSONEncoder(indent=2).iterencode(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as JSON indented by 2 spaces
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON text
+    """
+    return "".join(iterencode(obj))
+
+
+def encode(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON indented by 2 spaces
+
+    Unlike dumps(), non-ASCII text may be written as UTF-8 rather than
+    escaped; this is for files read back with loads().
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON document as bytes
+    """
+    data = _orjson_dumps(obj)
+    if data is not None:
+        return data
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document
+
+    Documents orjson rejects but the standard library accepts, such as
+    ones containing NaN, are decoded by the standard library.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
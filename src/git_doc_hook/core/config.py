@@ -3,39 +3,43 @@
 Handles loading, validation, and default values for .git-doc-hook.yml
 """
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import copy
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import os
 import re
+import stat
+from functools import lru_cache
 
+# Parsed user configuration is cached as JSON in the project's per-user state
+# directory, outside the work tree, in a file named after a digest of the
+# YAML file's path and validated by its size, mtime and inode. The default
+# state directory is used: the configured one is only known once the file
+# has been parsed. Checkouts with the same directory name share that
+# directory, so the file name keeps their caches apart.
+_CACHE_FILE = "config.{digest}.cache.json"
 
-def glob_match(pattern: str, path: str) -> bool:
-    """Match a path against a glob pattern.
+# Parsed user configurations loaded in this process, as JSON text keyed by
+# configuration file: path -> ([size, mtime_ns, inode], text)
+_PARSED_CONFIGS: Dict[Path, Tuple[List[int], str]] = {}
 
-    Supports: *, ?, ** (recursive wildcard)
+
+@lru_cache(maxsize=256)
+def _glob_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a glob pattern into a regex, see glob_match()
 
     Args:
-        pattern: Glob pattern (e.g., "services/**/*.py", "**/*.py")
-        path: File path to match (e.g., "services/auth.py", "main.py")
+        pattern: Glob pattern
 
     Returns:
-        True if path matches pattern
-
-    Examples:
-        >>> glob_match("services/**/*.py", "services/auth.py")
-        True
-        >>> glob_match("services/**/*.py", "services/nested/file.py")
-        True
-        >>> glob_match("**/*.py", "main.py")
-        True
-        >>> glob_match("*.py", "src/main.py")
-        False
+        Compiled regex matching whole paths
     """
     # Handle leading ** specially (matches any prefix)
     if pattern.startswith("**/"):
         rest = pattern[3:]  # Remove **/
         # Build: ^.* + escaped_rest (with * -> [^/]*)
         escaped = re.escape(rest).replace(r"\*", "[^/]*").replace(r"\?", ".")
-        return bool(re.match(f'^.*{escaped}$', path))
+        return re.compile(f'^.*{escaped}$')
 
     # Standard escaping
     regex = re.escape(pattern)
@@ -52,7 +56,70 @@ def glob_match(pattern: str, path: str) -> bool:
     # ? matches any single char
     regex = regex.replace(r'\?', '.')
 
-    return bool(re.match(f'^{regex}$', path))
+    return re.compile(f'^{regex}$')
+
+
+def _keyword_regex(keywords: List[str]) -> Optional["re.Pattern[str]"]:
+    """Compile keywords into one pattern matching any of them as a substring
+
+    Args:
+        keywords: Keywords to match
+
+    Returns:
+        Compiled pattern, or None if there are no keywords
+    """
+    # Categories may share keywords; each only needs one branch
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+def _flatten(config: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """Yield (dot-notation key, value) for every value in a nested dict
+
+    Dicts are yielded as well as their contents. Keys that are not strings
+    or contain a dot cannot be reached by dot-notation, so they are skipped.
+
+    Args:
+        config: Nested configuration dict
+        prefix: Dot-notation key of config itself
+
+    Returns:
+        Iterator of (key, value) pairs
+    """
+    for key, value in config.items():
+        if not isinstance(key, str) or "." in key:
+            continue
+        path = prefix + key
+        yield path, value
+        if isinstance(value, dict):
+            yield from _flatten(value, path + ".")
+
+
+def glob_match(pattern: str, path: str) -> bool:
+    """Match a path against a glob pattern.
+
+    Supports: *, ?, ** (recursive wildcard)
+
+    Args:
+        pattern: Glob pattern (e.g., "services/**/*.py", "**/*.py")
+        path: File path to match (e.g., "services/auth.py", "main.py")
+
+    Returns:
+        True if path matches pattern
+
+    Examples:
+        >>> glob_match("services/**/*.py", "services/auth.py")
+        True
+        >>> glob_match("services/**/*.py", "services/nested/file.py")
+        True
+        >>> glob_match("**/*.py", "main.py")
+        True
+        >>> glob_match("*.py", "src/main.py")
+        False
+    """
+    return bool(_glob_regex(pattern).match(path))
 
 
 class Config:
@@ -125,6 +192,7 @@ class Config:
         "commit": {
             "message_template": "docs(auto): update {layers} - {reason}",
             "auto_push": False,
+            "stage_untracked": True,
         },
         "templates": {
             "enabled": True,
@@ -137,6 +205,9 @@ class Config:
         },
     }
 
+    # Defaults as JSON; decoding it is a much cheaper fresh copy than deepcopy
+    _DEFAULT_JSON = json.dumps(DEFAULT_CONFIG)
+
     def __init__(self, project_path: str = "."):
         """Initialize configuration for a project
 
@@ -146,50 +217,163 @@ class Config:
         self.project_path = Path(project_path).resolve()
         self.config_file = self.project_path / ".git-doc-hook.yml"
         self._config: Optional[Dict[str, Any]] = None
+        # stat() of the configuration file taken by load() or save(), None
+        # if it does not exist
+        self._config_stat: Optional[os.stat_result] = None
+        # Every value by dot-notation key, built on first get()
+        self._flat: Optional[Dict[str, Any]] = None
+        # Compiled rule patterns and matches per file path, built on first use
+        self._rule_regexes: Optional[List["re.Pattern[str]"]] = None
+        self._any_rule_regex: Optional["re.Pattern[str]"] = None
+        self._rules_by_path: Dict[str, List[int]] = {}
+        # Compiled keyword patterns per tuple of categories
+        self._keyword_patterns: Dict[Tuple[str, ...], Optional["re.Pattern[str]"]] = {}
 
     def load(self) -> Dict[str, Any]:
         """Load and merge configuration
 
+        The returned dict is the live configuration, so callers may modify
+        it; values derived from it by get() and friends are recomputed
+        afterwards.
+
         Returns:
             Merged configuration dict with defaults applied
         """
         if self._config is None:
-            self._config = copy.deepcopy(self.DEFAULT_CONFIG)
+            self._config = json.loads(self._DEFAULT_JSON)
 
-            if self.config_file.exists():
-                import yaml
-
-                user_config = yaml.safe_load(self.config_file.read_text())
-                if user_config:
-                    self._config = self._merge_config(self._config, user_config)
+            user_config = self._load_user_config()
+            if user_config:
+                self._config = self._merge_config(self._config, user_config)
 
             # Set project key if not configured
             if not self._config["state"]["project_key"]:
                 self._config["state"]["project_key"] = self.project_path.name
 
+        self._clear_memos()
         return self._config
 
+    def _clear_memos(self) -> None:
+        """Drop values derived from the configuration, after it may have changed"""
+        self._flat = None
+        self._rule_regexes = None
+        self._keyword_patterns = {}
+
+    def _load_user_config(self) -> Any:
+        """Load the user configuration file, through the JSON caches
+
+        The parsed file is cached as JSON both in memory, for Config
+        objects created later in the same process, and on disk. Each load
+        decodes a fresh copy, so callers may modify the result.
+
+        Returns:
+            Parsed .git-doc-hook.yml, or None if the file does not exist
+        """
+        try:
+            st = self._config_stat = self.config_file.stat()
+        except OSError:
+            self._config_stat = None
+            return None
+
+        # The inode catches files replaced by a rename within one mtime tick
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        memo = _PARSED_CONFIGS.get(self.config_file)
+        if memo is not None and memo[0] == stamp:
+            return json.loads(memo[1])
+
+        cache_file = (
+            Path(self.DEFAULT_CONFIG["state"]["dir"]).expanduser()
+            / self.project_path.name
+            / _CACHE_FILE.format(
+                digest=hashlib.sha256(str(self.config_file).encode("utf-8")).hexdigest()[:16]
+            )
+        )
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            if cached["stamp"] == stamp and cached["path"] == str(self.config_file):
+                _PARSED_CONFIGS[self.config_file] = (stamp, json.dumps(cached["config"]))
+                return cached["config"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        import yaml
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        user_config = yaml.load(self.config_file.read_text(), Loader=loader)
+        text = self._encode_cache(user_config)
+        if text is not None:
+            _PARSED_CONFIGS[self.config_file] = (stamp, text)
+            self._store_cache(cache_file, stamp, text)
+        return user_config
+
+    @staticmethod
+    def _encode_cache(user_config: Any) -> Optional[str]:
+        """Encode a parsed user configuration as JSON for the caches
+
+        Args:
+            user_config: Parsed configuration
+
+        Returns:
+            JSON text, or None if the configuration does not survive a
+            JSON round trip unchanged (e.g. dates or non-string keys)
+        """
+        try:
+            text = json.dumps(user_config)
+            if json.loads(text) != user_config:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return text
+
+    def _store_cache(self, cache_file: Path, stamp: List[int], text: str) -> None:
+        """Write the parsed user configuration to the JSON cache file
+
+        Nothing is written unless the project's state directory exists.
+        Failures are ignored; the cache is purely an optimization.
+
+        Args:
+            cache_file: Path of the cache file
+            stamp: Size, mtime and inode of the configuration file
+            text: Configuration as JSON, from _encode_cache()
+        """
+        if not cache_file.parent.is_dir():
+            return
+
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            header = json.dumps({"path": str(self.config_file), "stamp": stamp})[:-1]
+            tmp.write_text(f'{header}, "config": {text}}}', encoding="utf-8")
+            os.replace(tmp, cache_file)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
     def _merge_config(
         self, default: Dict[str, Any], user: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Deep merge user config with defaults
+        """Deep merge user config into defaults
+
+        default is updated in place, without copying; load() passes it a
+        fresh copy of DEFAULT_CONFIG. Values of user are shared with the
+        result.
 
         Args:
-            default: Default configuration
+            default: Default configuration, updated in place
             user: User-provided configuration
 
         Returns:
-            Merged configuration
+            Merged configuration (default)
         """
-        result = copy.deepcopy(default)
-
         for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_config(result[key], value)
+            current = default.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                self._merge_config(current, value)
             else:
-                result[key] = value
+                default[key] = value
 
-        return result
+        return default
 
     def save(self, config: Optional[Dict[str, Any]] = None) -> None:
         """Save configuration to file
@@ -200,8 +384,42 @@ class Config:
         import yaml
 
         to_save = config or self._config or self.load()
-        self.config_file.write_text(yaml.dump(to_save, default_flow_style=False, sort_keys=False))
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        data = yaml.dump(
+            to_save, Dumper=dumper, default_flow_style=False, sort_keys=False, encoding="utf-8"
+        )
+
+        # Written to a temporary file and renamed over the old one, so the
+        # configuration is never left half-written; the file keeps its mode
+        st = self._config_stat
+        if st is None:
+            try:
+                st = self.config_file.stat()
+            except FileNotFoundError:
+                pass
+        mode = stat.S_IMODE(st.st_mode) if st is not None else 0o666
+        tmp = self.config_file.with_name(f"{self.config_file.name}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.config_file)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        self._config_stat = self.config_file.stat()
         self._config = to_save
+        self._clear_memos()
+
+    @property
+    def config_exists(self) -> bool:
+        """Whether the configuration file exists, as of the last load or save"""
+        if self._config is None:
+            self.load()
+        return self._config_stat is not None
 
     @property
     def state_dir(self) -> Path:
@@ -235,6 +453,25 @@ class Config:
         """Get keyword mappings"""
         return self.get("keywords", {})
 
+    def keyword_pattern(self, *categories: str) -> Optional["re.Pattern[str]"]:
+        """Get a compiled pattern matching any keyword of the given categories
+
+        Keywords match as substrings, as with ``keyword in message``. The
+        pattern is compiled once per Config.
+
+        Args:
+            *categories: Keyword categories, e.g. "troubleshooting"
+
+        Returns:
+            Compiled pattern, or None if the categories have no keywords
+        """
+        if categories not in self._keyword_patterns:
+            keywords = self.keywords
+            self._keyword_patterns[categories] = _keyword_regex(
+                [kw for category in categories for kw in keywords.get(category, [])]
+            )
+        return self._keyword_patterns[categories]
+
     @property
     def templates_enabled(self) -> bool:
         """Check if template rendering is enabled"""
@@ -270,17 +507,9 @@ class Config:
         Returns:
             Configuration value or default
         """
-        config = self._config or self.load()
-        keys = key.split(".")
-
-        value = config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        if self._flat is None:
+            self._flat = dict(_flatten(self._config or self.load()))
+        return self._flat.get(key, default)
 
     def get_memos_category(self, category: str) -> Optional[Dict[str, Any]]:
         """Get MemOS category configuration
@@ -316,12 +545,53 @@ class Config:
         Returns:
             List of matching rules
         """
-        matching = []
-        for rule in self.rules:
-            rule_pattern = rule.get("pattern", "")
-            if glob_match(rule_pattern, pattern):
-                matching.append(rule)
-        return matching
+        rules = self.rules
+        return [rules[i] for i in self.get_rule_indices(pattern)]
+
+    def get_rule_indices(self, pattern: str) -> List[int]:
+        """Get the positions in rules of the rules that match a file pattern
+
+        Args:
+            pattern: File pattern to match
+
+        Returns:
+            List of indices into rules
+        """
+        regexes = self._rule_regexes
+        if regexes is None:
+            regexes = self._rule_regexes = [
+                _glob_regex(rule.get("pattern", "")) for rule in self.rules
+            ]
+            # One alternation over all rules, with rule i in group "r<i>".
+            # Alternatives are tried in order, so a match names the first
+            # matching rule and only the rules after it need checking.
+            self._any_rule_regex = re.compile(
+                "|".join(f"(?P<r{i}>{regex.pattern})" for i, regex in enumerate(regexes))
+            ) if regexes else None
+            self._rules_by_path = {}
+
+        matching = self._rules_by_path.get(pattern)
+        if matching is None:
+            match = self._any_rule_regex.match(pattern) if self._any_rule_regex else None
+            if match is None:
+                matching = []
+            else:
+                first = int(match.lastgroup[1:])
+                matching = [first] + [
+                    i for i in range(first + 1, len(regexes)) if regexes[i].match(pattern)
+                ]
+            self._rules_by_path[pattern] = matching
+        return list(matching)
+
+    @property
+    def rules_digest(self) -> str:
+        """Get a digest identifying the configured rules
+
+        Rule indices recorded under one digest are only valid for rules
+        with the same digest.
+        """
+        text = json.dumps(self.rules, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
     def validate(self) -> List[str]:
         """Validate current configuration
@@ -332,7 +602,7 @@ class Config:
         errors = []
 
         # Check required structure
-        config = self.load()
+        config = self._config or self.load()
         if "layers" not in config:
             errors.append("Missing 'layers' section")
         if "rules" not in config:
@@ -8,6 +8,7 @@ import re
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import List, Optional, Set
 
@@ -27,6 +28,11 @@ class Commit:
         """Get short commit hash"""
         return self.hash[:7]
 
+    @cached_property
+    def message_lower(self) -> str:
+        """Get the lowercased commit message, computed once"""
+        return self.message.lower()
+
     def contains_keywords(self, keywords: List[str]) -> bool:
         """Check if commit message contains any keywords
 
@@ -36,7 +42,7 @@ class Commit:
         Returns:
             True if any keyword found (case-insensitive)
         """
-        message_lower = self.message.lower()
+        message_lower = self.message_lower
         return any(kw.lower() in message_lower for kw in keywords)
 
     def get_type(self) -> str:
@@ -62,6 +68,34 @@ class Commit:
         return None
 
 
+# git log format of a commit line. Fields are separated by the ASCII unit
+# separator, which cannot occur in them, and the subject comes last, so that
+# a "|" or any other character in it does not cut the message short
+_COMMIT_FORMAT = "--pretty=format:%H%x1f%an%x1f%ai%x1f%s"
+_FIELD_SEP = "\x1f"
+
+
+def _parse_commit_line(line: str) -> Optional[Commit]:
+    """Parse a commit line written with _COMMIT_FORMAT
+
+    Args:
+        line: Line of git log output
+
+    Returns:
+        Commit without files, or None if line is not a commit line
+    """
+    parts = line.split(_FIELD_SEP, 3)
+    if len(parts) < 4:
+        return None
+
+    commit_hash, author, date_str, message = parts
+    try:
+        date = datetime.fromisoformat(date_str)
+    except ValueError:
+        date = datetime.now()
+    return Commit(hash=commit_hash, message=message, author=author, date=date, files=[])
+
+
 @dataclass
 class FileChange:
     """Represents a file change in a commit"""
@@ -252,7 +286,7 @@ class GitManager:
         Returns:
             List of commits
         """
-        args = ["log", f"-{limit}", "--pretty=format:%H|%s|%an|%ai", "--name-only"]
+        args = ["log", f"-{limit}", _COMMIT_FORMAT, "--name-only"]
         if since_ref:
             args.append(f"{since_ref}..HEAD")
 
@@ -265,25 +299,11 @@ class GitManager:
                 continue
 
             # Check if this is a commit line or a file line
-            parts = line.split("|")
-            if len(parts) >= 4:
-                # This is a commit line
+            commit = _parse_commit_line(line)
+            if commit is not None:
                 if current_commit:
                     commits.append(current_commit)
-
-                commit_hash, message, author, date_str = parts[:4]
-                try:
-                    date = datetime.fromisoformat(date_str)
-                except ValueError:
-                    date = datetime.now()
-
-                current_commit = Commit(
-                    hash=commit_hash,
-                    message=message,
-                    author=author,
-                    date=date,
-                    files=[],
-                )
+                current_commit = commit
             elif current_commit is not None:
                 # This is a file line
                 current_commit.files.append(line)
@@ -429,19 +449,8 @@ class GitManager:
             HEAD commit or None
         """
         try:
-            result = self._run_git(["log", "-1", "--pretty=format:%H|%s|%an|%ai"])
-            if not result.stdout.strip():
-                return None
-
-            parts = result.stdout.strip().split("|")
-            if len(parts) >= 4:
-                return Commit(
-                    hash=parts[0],
-                    message=parts[1],
-                    author=parts[2],
-                    date=datetime.fromisoformat(parts[3]),
-                    files=[],
-                )
+            result = self._run_git(["log", "-1", _COMMIT_FORMAT])
+            return _parse_commit_line(result.stdout.rstrip("\n"))
         except GitError:
             pass
         return None
@@ -2,16 +2,22 @@
 
 Manages pending update state with multi-project isolation.
 """
-import json
+import os
 import time
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, TextIO, Tuple
 
+from ._json import encode, iterencode, loads
 from .config import Config
 
 
+# How a state file without a pending update starts: "pending" is always the
+# first key, and both JSON encoders write it like this with indent=2
+_NO_PENDING_PREFIX = b'{\n  "pending": null'
+
+
 @dataclass
 class PendingUpdate:
     """Represents a pending documentation update
@@ -20,13 +26,17 @@ class PendingUpdate:
     by Claude Code (consumer) rather than directly by git-doc-hook.
     """
 
-    layers: Set[str]
+    # Always a frozenset, so callers can use it without copying
+    layers: FrozenSet[str]
     reason: str
     triggered_by: str  # commit hash or "manual"
     timestamp: float
     files: List[str]
     commit_message: str
     memos_records: List[Dict[str, Any]] = field(default_factory=list)
+    # Indices of the config rules matching each file, see Config.rules_digest
+    matched_rules: Dict[str, List[int]] = field(default_factory=dict)
+    rules_digest: str = ""
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -38,19 +48,23 @@ class PendingUpdate:
             "files": self.files,
             "commit_message": self.commit_message,
             "memos_records": self.memos_records,
+            "matched_rules": self.matched_rules,
+            "rules_digest": self.rules_digest,
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> "PendingUpdate":
         """Create from dictionary with backward compatibility"""
         return cls(
-            layers=set(data.get("layers", [])),
+            layers=frozenset(data.get("layers", [])),
             reason=data.get("reason", ""),
             triggered_by=data.get("triggered_by", ""),
             timestamp=data.get("timestamp", time.time()),
-            files=data.get("files", []),
+            files=list(data.get("files", [])),
             commit_message=data.get("commit_message", ""),
-            memos_records=data.get("memos_records", []),
+            memos_records=list(data.get("memos_records", [])),
+            matched_rules=dict(data.get("matched_rules", {})),
+            rules_digest=data.get("rules_digest", ""),
         )
 
 
@@ -62,6 +76,8 @@ class StateManager:
     """
 
     STATE_FILE = "pending.json"
+    # Number of history entries kept
+    HISTORY_LIMIT = 100
 
     def __init__(self, project_path: str = ".", config: Optional[Config] = None):
         """Initialize state manager
@@ -78,18 +94,37 @@ class StateManager:
         # Ensure state directory exists
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
+        # Last state loaded or saved, valid while the state file's
+        # (size, mtime_ns, inode) is still _state_stamp
+        self._state: Optional[Dict] = None
+        self._state_stamp: Optional[Tuple[int, int, int]] = None
+
     def _load_state(self) -> Dict:
         """Load state from file
 
+        The parsed state is reused until the file changes, so the result
+        is shared between calls: callers may only modify it to pass it
+        to _save_state().
+
         Returns:
             State dictionary
         """
-        if self.state_file.exists():
-            try:
-                return json.loads(self.state_file.read_text())
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {"pending": None, "history": []}
+        try:
+            st = self.state_file.stat()
+        except OSError:
+            return {"pending": None, "history": []}
+
+        stamp = (st.st_size, st.st_mtime_ns, st.st_ino)
+        if self._state is not None and self._state_stamp == stamp:
+            return self._state
+
+        try:
+            state = loads(self.state_file.read_bytes())
+        except (ValueError, OSError):
+            return {"pending": None, "history": []}
+
+        self._state, self._state_stamp = state, stamp
+        return state
 
     def _save_state(self, state: Dict) -> None:
         """Save state to file
@@ -97,34 +132,74 @@ class StateManager:
         Args:
             state: State dictionary to save
         """
-        self.state_file.write_text(json.dumps(state, indent=2))
+        data = encode(state)
+        # Written to a temporary file and renamed over the state file, so
+        # readers never see a partly written file. The stamp comes from the
+        # written descriptor; the rename keeps size, mtime and inode.
+        tmp = self.state_file.with_name(f"{self.STATE_FILE}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                st = os.fstat(fd)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            # state may be the cached dict with unsaved changes
+            self._state = self._state_stamp = None
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        self._state, self._state_stamp = state, (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    def _push_history(self, state: Dict, entry: Dict) -> None:
+        """Add an entry to the front of the history, dropping the oldest
+
+        The list is trimmed in place instead of being copied by a slice.
+
+        Args:
+            state: State dictionary
+            entry: History entry
+        """
+        history = state.setdefault("history", [])
+        history.insert(0, entry)
+        del history[self.HISTORY_LIMIT:]
 
     def set_pending(
         self,
-        layers: Set[str],
+        layers: Iterable[str],
         reason: str,
         triggered_by: str,
         files: List[str],
         commit_message: str,
+        matched_rules: Optional[Dict[str, List[int]]] = None,
+        rules_digest: str = "",
     ) -> None:
         """Set a pending update
 
         Args:
-            layers: Set of layer names that need updating
+            layers: Layer names that need updating
             reason: Human-readable reason for the update
             triggered_by: Commit hash or "manual"
             files: List of changed files
             commit_message: Associated commit message
+            matched_rules: Indices of the config rules matching each file
+            rules_digest: Config.rules_digest of the rules matched_rules
+                          refers to
         """
         state = self._load_state()
 
         pending = PendingUpdate(
-            layers=layers,
+            layers=frozenset(layers),
             reason=reason,
             triggered_by=triggered_by,
             timestamp=time.time(),
             files=files,
             commit_message=commit_message,
+            matched_rules=matched_rules or {},
+            rules_digest=rules_digest,
         )
 
         state["pending"] = pending.to_dict()
@@ -142,18 +217,36 @@ class StateManager:
             return PendingUpdate.from_dict(pending_data)
         return None
 
+    def write_pending_json(self, fp: TextIO) -> None:
+        """Write the pending update as indented JSON
+
+        The document is encoded incrementally, so the output is never
+        held in memory as a whole:
+
+            {"has_pending": bool, "pending": PendingUpdate dict or null}
+
+        Args:
+            fp: Text stream to write to
+        """
+        pending = self.get_pending()
+        result = {
+            "has_pending": pending is not None,
+            "pending": pending.to_dict() if pending else None,
+        }
+        for chunk in iterencode(result):
+            fp.write(chunk)
+        fp.write("\n")
+
     def clear_pending(self) -> None:
         """Clear pending update state"""
         state = self._load_state()
 
         # Move current pending to history
         if state.get("pending"):
-            state["history"].insert(0, {
+            self._push_history(state, {
                 **state["pending"],
                 "completed_at": time.time(),
             })
-            # Keep only last 100 history entries
-            state["history"] = state["history"][:100]
 
         state["pending"] = None
         self._save_state(state)
@@ -166,7 +259,7 @@ class StateManager:
         """
         return self.get_pending() is not None
 
-    def get_pending_layers(self) -> Set[str]:
+    def get_pending_layers(self) -> FrozenSet[str]:
         """Get layers with pending updates
 
         Returns:
@@ -175,7 +268,7 @@ class StateManager:
         pending = self.get_pending()
         if pending:
             return pending.layers
-        return set()
+        return frozenset()
 
     def show_summary(self) -> str:
         """Get a human-readable summary of pending state
@@ -216,7 +309,7 @@ class StateManager:
 
     def add_to_history(
         self,
-        layers: Set[str],
+        layers: Iterable[str],
         action: str,
         details: Optional[Dict] = None,
     ) -> None:
@@ -236,9 +329,7 @@ class StateManager:
             "details": details or {},
         }
 
-        state["history"].insert(0, entry)
-        state["history"] = state["history"][:100]
-
+        self._push_history(state, entry)
         self._save_state(state)
 
     def get_project_state_dir(self) -> Path:
@@ -256,20 +347,27 @@ class StateManager:
 
     # MemOS record management methods
 
-    def add_memos_record(self, record: Dict[str, Any]) -> None:
+    def add_memos_record(self, record: Dict[str, Any]) -> int:
         """Add a MemOS record to pending state
 
         Args:
             record: Dictionary containing MemOS record data with keys:
                     content, record_type, project, commit_hash,
                     commit_message, files, metadata, timestamp, cube_id
+
+        Returns:
+            Number of MemOS records now pending, 0 if there is no pending
+            update to add the record to
         """
         state = self._load_state()
         pending = state.get("pending")
 
         if pending:
-            pending.setdefault("memos_records", []).append(record)
+            records = pending.setdefault("memos_records", [])
+            records.append(record)
             self._save_state(state)
+            return len(records)
+        return 0
 
     def get_pending_memos_records(self) -> List[Dict[str, Any]]:
         """Get MemOS records pending sync
@@ -279,7 +377,7 @@ class StateManager:
         """
         state = self._load_state()
         pending = state.get("pending")
-        return pending.get("memos_records", []) if pending else []
+        return list(pending.get("memos_records", [])) if pending else []
 
     def clear_pending_memos(self, only_synced: bool = False) -> int:
         """Clear pending MemOS records
@@ -347,25 +445,33 @@ class StateManager:
 
         projects = []
 
-        if not base_dir.exists():
+        try:
+            with os.scandir(base_dir) as it:
+                entries = list(it)
+        except OSError:
             return projects
 
-        for project_dir in base_dir.iterdir():
-            if not project_dir.is_dir():
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+
+            state_file = Path(entry.path) / cls.STATE_FILE
+            try:
+                with open(state_file, "rb") as f:
+                    # Files without a pending update are recognized from
+                    # their first bytes, without reading their history
+                    head = f.read(len(_NO_PENDING_PREFIX))
+                    if head == _NO_PENDING_PREFIX:
+                        continue
+                    state = loads(head + f.read())
+            except (ValueError, OSError):
                 continue
 
-            state_file = project_dir / cls.STATE_FILE
-            if state_file.exists():
-                try:
-                    state = json.loads(state_file.read_text())
-                    if state.get("pending"):
-                        pending = state["pending"]
-                        projects.append({
-                            "name": project_dir.name,
-                            "path": str(project_dir),
-                            "pending": pending,
-                        })
-                except (json.JSONDecodeError, IOError):
-                    pass
+            if isinstance(state, dict) and state.get("pending"):
+                projects.append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "pending": state["pending"],
+                })
 
         return projects
@@ -7,7 +7,7 @@ import re
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +56,7 @@ class DocumentUpdater:
         target_file: Path,
         section: str,
         row_data: Dict[str, str],
-        table_headers: Optional[List[str]] = None,
+        table_headers: Optional[Sequence[str]] = None,
     ) -> UpdateResult:
         """Append a row to a Markdown table in a section
 
@@ -311,7 +311,7 @@ class DocumentUpdater:
         target_file: Path,
         section: str,
         row_data: Dict[str, str],
-        table_headers: Optional[List[str]],
+        table_headers: Optional[Sequence[str]],
     ) -> UpdateResult:
         """Create a new file with a table"""
         headers = table_headers or list(row_data.keys())
@@ -347,7 +347,7 @@ class DocumentUpdater:
         lines: List[str],
         section: str,
         row_data: Dict[str, str],
-        table_headers: Optional[List[str]],
+        table_headers: Optional[Sequence[str]],
     ) -> UpdateResult:
         """Append a new section with table to file"""
         headers = table_headers or list(row_data.keys())
@@ -369,7 +369,7 @@ class DocumentUpdater:
         lines: List[str],
         section_index: int,
         row_data: Dict[str, str],
-        table_headers: Optional[List[str]],
+        table_headers: Optional[Sequence[str]],
     ) -> UpdateResult:
         """Insert a table after a section header"""
         headers = table_headers or list(row_data.keys())
@@ -439,7 +439,7 @@ class DocumentUpdater:
                 cells.append(cell)
         return cells
 
-    def _format_table_row(self, cells: List[str]) -> str:
+    def _format_table_row(self, cells: Sequence[str]) -> str:
         """Format cells as a Markdown table row"""
         return "| " + " | ".join(str(c) for c in cells) + " |"
 
@@ -504,6 +504,17 @@ class DocumentUpdater:
         self._results.clear()
 
 
+def _read_text_if_exists(path: Path) -> str:
+    """Read a file, or return "" if it does not exist
+
+    Opening the file directly saves the separate stat() of an exists() check.
+    """
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        return ""
+
+
 class ConfigFileUpdater:
     """Updater for AI assistant config files (.clinerules, .cursorrules)"""
 
@@ -541,16 +552,14 @@ class ConfigFileUpdater:
             UpdateResult with outcome
         """
         target_file = project_path / ".clinerules"
-        current_content = existing_content or (target_file.read_text() if target_file.exists() else "")
+        current_content = existing_content or _read_text_if_exists(target_file)
 
         # Generate new content
         new_sections = self._generate_pattern_sections(patterns)
 
         # Check what's missing
-        missing_patterns = []
-        for pattern in patterns:
-            if pattern.lower() not in current_content.lower():
-                missing_patterns.append(pattern)
+        current_lower = current_content.lower()
+        missing_patterns = [p for p in patterns if p.lower() not in current_lower]
 
         if not missing_patterns:
             return UpdateResult(
@@ -594,7 +603,7 @@ class ConfigFileUpdater:
         """
         # Similar to clinerules but with different format
         target_file = project_path / ".cursorrules"
-        current_content = target_file.read_text() if target_file.exists() else ""
+        current_content = _read_text_if_exists(target_file)
 
         # Generate cursor-specific format
         new_content = self._generate_cursor_content(patterns, current_content)
@@ -0,0 +1,12 @@
+"""Shared test fixtures"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def analysis_cache_dir(tmp_path, monkeypatch):
+    """Keep analysis results out of the developer's ~/.git-doc-hook cache"""
+    from git_doc_hook.analyzers import _cache
+
+    cache_dir = tmp_path / "analysis-cache"
+    monkeypatch.setattr(_cache, "CACHE_DIR", cache_dir)
+    return cache_dir
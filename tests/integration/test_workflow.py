@@ -280,6 +280,11 @@ def test_config_file_updater(tmp_path):
     assert "Testing" in content
     assert "API Patterns" in content
 
+    # Patterns already in the existing file are not added again
+    result = updater.update_clinerules(project_path=project, patterns=["testing", "Caching"])
+    assert result.message == "Added 1 pattern sections"
+    assert clinerules.read_text().startswith(content.rstrip())
+
 
 def test_extract_code_patterns(tmp_path):
     """Test code pattern extraction"""
@@ -47,3 +47,673 @@ def test_complexity_metrics():
     )
 
     assert high_metrics.is_high_complexity
+
+
+def test_bash_extract_functions(tmp_path):
+    """Test Bash function detection for all definition styles"""
+    script = tmp_path / "deploy.sh"
+    script.write_text(
+        "#!/bin/bash\n"
+        "build() {\n"
+        "  make\n"
+        "}\n"
+        "function release {\n"
+        "  echo done\n"
+        "}\n"
+        "function cleanup() {\n"
+        "  rm -rf out\n"
+        "}\n"
+        "# helper() {\n"
+    )
+
+    result = get_analyzer(str(script)).analyze(str(script))
+
+    assert [(f.name, f.line_start) for f in result.functions] == [
+        ("build", 2),
+        ("release", 5),
+        ("cleanup", 8),
+    ]
+    assert result.complexity.function_count == 3
+
+
+def test_calculate_complexity_counts_branches():
+    """Test line-based complexity fallback counts each branching line once"""
+    from git_doc_hook.analyzers import PythonAnalyzer
+
+    source = (
+        "def check(x):\n"
+        "    if x and x > 1:\n"
+        "        return 1\n"
+        "    else:\n"
+        "        return 2\n"
+        "notify = True\n"
+    )
+
+    metrics = PythonAnalyzer().calculate_complexity(source)
+
+    assert metrics.line_count == 7
+    assert metrics.code_lines == 6
+    assert metrics.complexity_score == 3
+
+
+def test_get_analyzer_reuses_instances():
+    """Test analyzer dispatch returns shared instances"""
+    assert get_analyzer("a.py") is get_analyzer("b/c.PY")
+
+
+def test_get_analyzer_shebang(tmp_path):
+    """Test extensionless scripts are detected by shebang"""
+    script = tmp_path / "run"
+    script.write_text("#!/usr/bin/env bash\necho hi\n")
+
+    assert get_analyzer(str(script)).language == "Bash"
+
+
+def test_get_analyzer_fallback(tmp_path):
+    """Test unknown files fall back to the generic analyzer"""
+    data = tmp_path / "notes.txt"
+    data.write_text("plain text\n")
+
+    analyzer = get_analyzer(str(data))
+    result = analyzer.analyze(str(data))
+
+    assert analyzer.language == "Unknown"
+    assert result.complexity.line_count == 2
+
+
+def test_analysis_cache_hit(tmp_path, monkeypatch):
+    """Test unchanged files are served from the analysis cache"""
+    from git_doc_hook.analyzers import _cache, PythonAnalyzer
+
+    monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path / "cache")
+    source = tmp_path / "mod.py"
+    source.write_text("def f():\n    return 1\n")
+    analyzer = PythonAnalyzer()
+
+    first = analyzer.analyze(str(source))
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 1
+
+    second = analyzer.analyze(str(source))
+    assert second == first
+    assert second is not first
+
+    source.write_text("def f():\n    return 1\n\ndef g():\n    return 2\n")
+    third = analyzer.analyze(str(source))
+    assert [f.name for f in third.functions] == ["f", "g"]
+
+
+def test_analysis_cache_hit_does_not_read_file(tmp_path, monkeypatch):
+    """Test cache hits are found from the file's stat without reading it"""
+    import os
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = tmp_path / "app.js"
+    source.write_text("function f() {}\n")
+    analyzer = JavaScriptAnalyzer()
+    first = analyzer.analyze(str(source))
+
+    def fail(self):
+        raise AssertionError("file read on a cache hit")
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "read_bytes", fail)
+        assert analyzer.analyze(str(source)) == first
+
+    # Same size and mtime, but renamed over the file: a new inode
+    st = source.stat()
+    replacement = tmp_path / "new.js"
+    replacement.write_text("function g() {}\n")
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, source)
+    assert [f.name for f in analyzer.analyze(str(source)).functions] == ["g"]
+
+
+def test_analysis_cache_skips_context(tmp_path, analysis_cache_dir):
+    """Test analyses with a per-commit context are not cached"""
+    from git_doc_hook.analyzers import PythonAnalyzer
+
+    source = tmp_path / "mod.py"
+    source.write_text("def f():\n    return 1\n")
+    analyzer = PythonAnalyzer()
+
+    fixed = analyzer.analyze(str(source), {"commit_message": "fix: crash"})
+    assert "memo" in fixed.layers
+    assert not analysis_cache_dir.exists()
+
+    assert "memo" not in analyzer.analyze(str(source)).layers
+    assert "memo" in analyzer.analyze(str(source), {"commit_message": "fix: crash"}).layers
+
+
+def test_analysis_cache_evicts_least_recently_used(tmp_path, analysis_cache_dir, monkeypatch):
+    """Test the analysis cache is pruned once it holds too many entries"""
+    import os
+    from git_doc_hook.analyzers import _cache, PythonAnalyzer
+
+    monkeypatch.setattr(_cache, "_MAX_ENTRIES", 4)
+    analyzer = PythonAnalyzer()
+    sources = []
+    for i in range(4):
+        source = tmp_path / f"mod{i}.py"
+        source.write_text(f"X = {i}\n")
+        analyzer.analyze(str(source))
+        sources.append(source)
+
+    # Age every entry, then use the first one again
+    for entry in analysis_cache_dir.iterdir():
+        os.utime(entry, ns=(0, 0))
+    analyzer.analyze(str(sources[0]))
+
+    extra = tmp_path / "extra.py"
+    extra.write_text("X = 4\n")
+    analyzer.analyze(str(extra))
+
+    assert len(list(analysis_cache_dir.glob("*.pkl"))) == 3
+
+    # The recently used and the new entry survived
+    misses = []
+    monkeypatch.setattr(_cache, "store", lambda key, result: misses.append(key))
+    analyzer.analyze(str(sources[0]))
+    analyzer.analyze(str(extra))
+    assert misses == []
+
+
+def test_bash_incremental_reanalysis(tmp_path):
+    """Test reusing a prior result only rescans the changed range"""
+    from git_doc_hook.analyzers import BashAnalyzer
+
+    script = tmp_path / "tool.sh"
+    script.write_text("a() {\n  :\n}\nb() {\n  :\n}\nc() {\n  :\n}\n")
+    analyzer = BashAnalyzer()
+    prior = analyzer.analyze.__wrapped__(analyzer, str(script))
+
+    # Insert a new function after a() and edit nothing else
+    script.write_text(
+        "a() {\n  :\n}\nnew() {\n  :\n}\nb() {\n  :\n}\nc() {\n  :\n}\n"
+    )
+    result = analyzer.analyze.__wrapped__(
+        analyzer, str(script), prior=prior, changed_lines=[4, 5, 6]
+    )
+    full = analyzer.analyze.__wrapped__(analyzer, str(script))
+
+    assert [(f.name, f.line_start) for f in result.functions] == [
+        ("a", 1), ("new", 4), ("b", 7), ("c", 10),
+    ]
+    assert result == full
+
+
+def test_bash_incremental_bypasses_cache(tmp_path, analysis_cache_dir):
+    """Test an incremental result is not served to a later full analysis"""
+    from git_doc_hook.analyzers import BashAnalyzer
+
+    script = tmp_path / "tool.sh"
+    script.write_text("a() {\n  :\n}\n")
+    analyzer = BashAnalyzer()
+    prior = analyzer.analyze(str(script))
+
+    # A stale changed range makes the incremental result miss the new function
+    script.write_text("a() {\n  :\n}\nb() {\n  :\n}\n")
+    incremental = analyzer.analyze(str(script), prior=prior, changed_lines=[1])
+    assert len(list(analysis_cache_dir.glob("*.pkl"))) == 1
+
+    full = analyzer.analyze(str(script))
+    assert [f.name for f in full.functions] == ["a", "b"]
+    assert full == analyzer.analyze.__wrapped__(analyzer, str(script))
+    assert incremental is not full
+
+
+def test_bash_keywords_match_whole_words(tmp_path):
+    """Test keyword scans ignore substrings such as 'fi' in 'file'"""
+    script = tmp_path / "check.sh"
+    script.write_text(
+        "if [ -f \"$file\" ]; then\n"
+        "  for x in a b; do\n"
+        "    echo \"$x\"\n"
+        "  done\n"
+        "fi\n"
+    )
+
+    complexity = get_analyzer(str(script)).analyze(str(script)).complexity
+
+    assert complexity.nesting_depth == 2
+    assert complexity.complexity_score == 3
+
+
+def test_get_functions_changed():
+    """Test functions are selected when any changed line falls inside them"""
+    from git_doc_hook.analyzers.base import AnalysisResult, FunctionInfo
+
+    functions = [
+        FunctionInfo(name=name, line_start=start, line_end=end, parameters=[], decorators=[])
+        for name, start, end in [("a", 1, 5), ("b", 7, 20), ("inner", 10, 12), ("c", 30, 31)]
+    ]
+    result = AnalysisResult(
+        file_path="x.py", language="Python", layers=[], actions=[], functions=functions
+    )
+
+    assert result.get_functions_changed([]) == []
+    assert [f.name for f in result.get_functions_changed([25, 11])] == ["b", "inner"]
+    assert [f.name for f in result.get_functions_changed([31, 5, 5])] == ["a", "c"]
+    assert result.get_functions_changed([6, 21, 40]) == []
+
+
+def test_get_functions_changed_sparse_lines():
+    """Test the indexed lookup used when few lines changed"""
+    from git_doc_hook.analyzers.base import AnalysisResult, FunctionInfo
+
+    functions = [
+        FunctionInfo(name=f"f{i}", line_start=i * 10, line_end=i * 10 + 5, parameters=[], decorators=[])
+        for i in range(1, 50)
+    ]
+    functions.append(
+        FunctionInfo(name="outer", line_start=1, line_end=400, parameters=[], decorators=[])
+    )
+    result = AnalysisResult(
+        file_path="x.py", language="Python", layers=[], actions=[], functions=functions
+    )
+
+    assert [f.name for f in result.get_functions_changed([103, 458])] == ["f10", "outer"]
+    assert [f.name for f in result.get_functions_changed([450])] == ["f45"]
+
+    functions.append(
+        FunctionInfo(name="late", line_start=449, line_end=452, parameters=[], decorators=[])
+    )
+    assert [f.name for f in result.get_functions_changed([450])] == ["f45", "late"]
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("Fixed crash on startup", ["memo", "traditional"]),
+    ("Architecture: split services", ["memo", "traditional"]),
+    ("fix bug in decision table", ["memo", "traditional"]),
+    ("Add login page", ["traditional"]),
+])
+def test_detect_layers(message, expected):
+    """Test layer detection from commit message keywords"""
+    analyzer = get_analyzer("app.py")
+
+    assert analyzer.detect_layers("app.py", {"commit_message": message}) == expected
+
+
+def test_bash_analyze_with_scandir_entry(tmp_path):
+    """Test executable detection from a cached os.scandir() entry"""
+    import os
+    from git_doc_hook.analyzers import BashAnalyzer
+
+    script = tmp_path / "run.sh"
+    script.write_text("#!/bin/bash\necho hi\n")
+    script.chmod(0o755)
+
+    with os.scandir(tmp_path) as entries:
+        entry = next(e for e in entries if e.name == "run.sh")
+        result = BashAnalyzer().analyze(entry.path, entry=entry)
+
+    assert result.metadata["is_executable"] is True
+
+
+@pytest.mark.parametrize("shebang,language", [
+    ("#!/bin/sh", "Bash"),
+    ("#!/usr/bin/env zsh", "Bash"),
+    ("#!/usr/bin/env python3.11", "Python"),
+    ("#!/usr/bin/env node", "JavaScript/TypeScript"),
+    ("#!/usr/bin/perl", "Unknown"),
+])
+def test_get_analyzer_shebang_interpreters(tmp_path, shebang, language):
+    """Test extensionless files dispatch on the shebang interpreter"""
+    script = tmp_path / "tool"
+    script.write_text(f"{shebang}\nbody\n")
+
+    assert get_analyzer(str(script)).language == language
+
+
+def test_analysis_result_lazy_containers():
+    """Test empty results allocate containers only on access"""
+    from git_doc_hook.analyzers.base import AnalysisResult, FunctionInfo
+
+    result = AnalysisResult(file_path="x.sh", language="Bash", layers=[], actions=[])
+
+    assert result.to_dict()["function_count"] == 0
+    assert result._functions is None and result._metadata is None
+    assert result.get_functions_changed([1, 2]) == []
+
+    result.functions.append(FunctionInfo(name="f", line_start=1, line_end=3, parameters=[], decorators=[]))
+    assert result.get_functions_changed([2])[0].name == "f"
+    assert result == AnalysisResult(
+        file_path="x.sh", language="Bash", layers=[], actions=[],
+        functions=[FunctionInfo(name="f", line_start=1, line_end=3, parameters=[], decorators=[])], metadata={},
+    )
+
+
+def test_analysis_result_dataclass_fields():
+    """Test lazy containers keep their public field names for dataclass helpers"""
+    import dataclasses
+    from git_doc_hook.analyzers.base import AnalysisResult, FunctionInfo
+
+    result = AnalysisResult(file_path="x.sh", language="Bash", layers=["memo"], actions=[])
+    func = FunctionInfo(name="f", line_start=1, line_end=3, parameters=[], decorators=[])
+
+    assert [f.name for f in dataclasses.fields(result)][-4:] == [
+        "functions", "classes", "imports", "metadata",
+    ]
+    assert "functions=[]" in repr(result)
+
+    replaced = dataclasses.replace(result, functions=[func])
+    assert replaced.functions == [func]
+    assert replaced.layers == ["memo"]
+    assert result.functions == []
+
+    assert dataclasses.asdict(replaced)["functions"] == [dataclasses.asdict(func)]
+    assert dataclasses.asdict(replaced)["metadata"] == {}
+
+
+def test_branching_keywords_compiled_per_class():
+    """Test subclasses declaring branching_keywords get their own pattern"""
+    from git_doc_hook.analyzers.base import GenericAnalyzer
+
+    class SwitchOnly(GenericAnalyzer):
+        branching_keywords = ("switch",)
+
+    source = "if (x) {\n  switch (y) {\n  }\n}\n"
+    assert GenericAnalyzer().calculate_complexity(source).complexity_score == 3
+    assert SwitchOnly().calculate_complexity(source).complexity_score == 2
+
+
+@pytest.mark.parametrize("min_files", [1000, 1])
+def test_analyze_paths(tmp_path, monkeypatch, min_files):
+    """Test batch analysis gives per-file results in order, serial or pooled"""
+    import git_doc_hook.analyzers as analyzers
+    from git_doc_hook.analyzers import _cache
+
+    monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(analyzers, "_PARALLEL_MIN_FILES", min_files)
+
+    paths = []
+    for i in range(4):
+        script = tmp_path / f"s{i}.sh"
+        script.write_text("".join(f"f{j}() {{\n}}\n" for j in range(i)))
+        paths.append(str(script))
+
+    results = list(analyzers.analyze_paths(paths, workers=2))
+
+    assert [r.file_path for r in results] == paths
+    assert [len(r.functions) for r in results] == [0, 1, 2, 3]
+
+
+def test_javascript_extract_functions():
+    """Test JS function extraction keeps per-line pattern priority"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = "\n".join([
+        "// helpers",
+        "function load(url, opts) {",
+        "  if (x) { return 1; }",
+        "const save = async (a) => a;",
+        "",
+        "  handler: function (e) {",
+        "if (ok) { function inner() {} }",
+    ])
+    functions = JavaScriptAnalyzer()._extract_functions(source)
+
+    assert [(f.name, f.line_start) for f in functions] == [
+        ("load", 2), ("save", 4), ("handler", 6), ("inner", 7),
+    ]
+    assert functions[0].parameters == ["url", "opts"]
+    assert functions[1].is_async
+
+
+def test_javascript_extract_imports():
+    """Test JS import and require statements are recognized"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = "\n".join([
+        "import React, { useState } from 'react';",
+        "  import './styles.css'",
+        "const fs = require('fs');",
+        "var x = require('path');",
+        "important('nope');",
+        "import broken from",
+    ])
+
+    assert JavaScriptAnalyzer()._extract_imports_js(source.split("\n")) == [
+        "import React, { useState } from 'react';",
+        "import './styles.css'",
+    ]
+
+
+def test_javascript_keywords_match_whole_words():
+    """Test JS control-flow keywords are not matched inside identifiers"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = "\n".join([
+        "const format = notify(before);",
+        "if (a && b) {",
+        "  doSomething();",
+        "}",
+    ])
+    metrics = JavaScriptAnalyzer()._calculate_complexity_js(source, source.split("\n"))
+
+    assert metrics.complexity_score == 2
+    assert metrics.nesting_depth == 1
+
+
+def test_python_analyze_single_pass(tmp_path):
+    """Test the one-pass AST statistics for a Python file"""
+    module = tmp_path / "mod.py"
+    module.write_text(
+        "import os\n"
+        "from typing import List, Dict\n"
+        "\n"
+        "class Store(base.Model):\n"
+        "    def get(self, key):\n"
+        "        if key and key in self.data:\n"
+        "            for item in self.data:\n"
+        "                with open(item) as f:\n"
+        "                    pass\n"
+        "\n"
+        "def helper(a, b, c):\n"
+        "    import json\n"
+        "    return a\n"
+    )
+    analyzer = get_analyzer(str(module))
+    result = analyzer.analyze.__wrapped__(analyzer, str(module))
+
+    assert [f.name for f in result.functions] == ["get", "helper"]
+    assert result.classes[0].bases == ["base.Model"]
+    assert result.imports == ["import os", "from typing import List, Dict", "import json"]
+    assert result.complexity.nesting_depth == 3
+    assert result.complexity.complexity_score == 5
+    assert result.complexity.param_count == 3
+
+
+def test_python_tree_cache(tmp_path):
+    """Test parsed trees are reused until the file changes"""
+    import os
+    from git_doc_hook.analyzers import PythonAnalyzer
+    from git_doc_hook.analyzers import python as python_analyzer
+
+    module = tmp_path / "mod.py"
+    module.write_text("def first():\n    pass\n")
+    analyzer = PythonAnalyzer()
+
+    assert analyzer.get_function_at_line(str(module), 1).name == "first"
+    hits = python_analyzer._parse.cache_info().hits
+    assert analyzer.get_function_at_line(str(module), 2).name == "first"
+    assert python_analyzer._parse.cache_info().hits == hits + 1
+
+    module.write_text("def second():\n    pass\n")
+    os.utime(module, ns=(1, 1))
+    assert analyzer.get_function_at_line(str(module), 1).name == "second"
+
+
+def test_javascript_extract_classes():
+    """Test JS class extraction line numbers and bases"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = "\n".join([
+        "class A {}",
+        "",
+        "class B extends A {} class C {}",
+        "export default class",
+        "D {}",
+    ])
+    classes = JavaScriptAnalyzer()._extract_classes(source)
+
+    assert [(c.name, c.line_start, c.bases) for c in classes] == [
+        ("A", 1, []), ("B", 3, ["A"]),
+    ]
+
+
+def test_python_attribute_bases(tmp_path):
+    """Test dotted base classes are named without reading the source"""
+    module = tmp_path / "bases.py"
+    module.write_text(
+        "class A(pkg.mod.Base, Mixin):\n    pass\n"
+        "class B(factory().Base):\n    pass\n"
+    )
+    analyzer = get_analyzer(str(module))
+    result = analyzer.analyze.__wrapped__(analyzer, str(module))
+
+    assert [c.bases for c in result.classes] == [
+        ["pkg.mod.Base", "Mixin"], ["factory().Base"],
+    ]
+
+
+@pytest.mark.parametrize("rel_path", [
+    "node_modules/lib/index.js",
+    "static/app.min.js",
+    "build/vendor/six.py",
+])
+def test_vendored_files_skipped(tmp_path, rel_path):
+    """Test vendored and minified files get an empty result"""
+    target = tmp_path / rel_path
+    target.parent.mkdir(parents=True)
+    target.write_text("function f(a) { if (a) { return 1; } }\n")
+    analyzer = get_analyzer(str(target))
+
+    result = analyzer.analyze.__wrapped__(analyzer, str(target))
+
+    assert result.complexity is None and result.layers == []
+
+
+def test_large_files_skipped(tmp_path, monkeypatch):
+    """Test files over the size limit are not read"""
+    from git_doc_hook.analyzers import base
+
+    monkeypatch.setattr(base, "MAX_ANALYZE_BYTES", 10)
+    target = tmp_path / "big.py"
+    target.write_text("x = 1\n" * 10)
+    analyzer = get_analyzer(str(target))
+
+    assert analyzer.analyze.__wrapped__(analyzer, str(target)).complexity is None
+
+
+@pytest.mark.parametrize("line,is_async", [
+    ("async function load(url) {", True),
+    ("const save = async (a) => a;", True),
+    ("  async fetchAll(ids) {", True),
+    ("function asynchronous(cb) {", False),
+    ("function run(async_) {", False),
+    ("function later() { return async () => 1; }", False),
+])
+def test_javascript_async_detection(line, is_async):
+    """Test async is matched as a keyword before the function name"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    functions = JavaScriptAnalyzer()._extract_functions(line)
+
+    assert functions[0].is_async is is_async
+
+
+def test_javascript_nesting_depth_counts_code_braces():
+    """Test JS nesting is brace depth, ignoring comments and strings"""
+    from git_doc_hook.analyzers import JavaScriptAnalyzer
+
+    source = "\n".join([
+        "function f(a) {",
+        "  if (a) {",
+        "    const s = '{{{';  // {{",
+        "    /* { */ return `${a}`;",
+        "  }",
+        "}",
+        "}}",
+        "const o = {};",
+    ])
+
+    assert JavaScriptAnalyzer()._calculate_nesting_depth(source) == 2
+
+
+@pytest.mark.parametrize("source", [
+    "a: function() {}, b : function(x) {}",
+    "x:functionfoo: function",
+    "f(a(b) {  g (c) {",
+    "= (f(a) { h() \n {",
+])
+def test_javascript_word_prefixed_counts_match_regex(source):
+    """Test the tail-first counter agrees with the full patterns"""
+    import re
+    from git_doc_hook.analyzers.javascript import (
+        _WORD_PREFIXED_TAILS,
+        _count_word_prefixed,
+    )
+
+    full = [r'\w+\s*:\s*function', r'\w+\s*\([^)]*\)\s*{']
+    for tail, pattern in zip(_WORD_PREFIXED_TAILS, full):
+        assert _count_word_prefixed(tail, source) == len(re.findall(pattern, source))
+
+
+def test_detect_layers_memoized_results_are_independent():
+    """Test memoized layer lists can be modified without affecting later calls"""
+    analyzer = get_analyzer("app.py")
+    context = {"commit_message": "fix crash"}
+
+    layers = analyzer.detect_layers("a.py", context)
+    layers.append("extra")
+
+    assert analyzer.detect_layers("b.py", context) == ["memo", "traditional"]
+    assert analyzer.detect_file_type("pkg/services/api.py") == "service"
+
+
+@pytest.mark.parametrize("name", ["legacy.py", "legacy.js"])
+def test_undecodable_bytes_are_replaced(tmp_path, name):
+    """Test files with invalid UTF-8 are still analyzed"""
+    target = tmp_path / name
+    target.write_bytes(b"// caf\xe9\nfunction f() {}\n" if name.endswith(".js")
+                       else b"# caf\xe9\ndef f():\n    pass\n")
+    analyzer = get_analyzer(str(target))
+
+    result = analyzer.analyze.__wrapped__(analyzer, str(target))
+
+    assert [f.name for f in result.functions] == ["f"]
+
+
+def test_imports_deduplicated(tmp_path):
+    """Test repeated imports are reported once, in first-seen order"""
+    module = tmp_path / "dup.py"
+    module.write_text("import os\nimport sys\n\ndef f():\n    import os\n")
+    script = tmp_path / "dup.js"
+    script.write_text("import a from 'a';\nimport b from 'b';\nimport a from 'a';\n")
+
+    for target, expected in [
+        (module, ["import os", "import sys"]),
+        (script, ["import a from 'a';", "import b from 'b';"]),
+    ]:
+        analyzer = get_analyzer(str(target))
+        assert analyzer.analyze.__wrapped__(analyzer, str(target)).imports == expected
+
+
+def test_analyze_many(tmp_path, monkeypatch):
+    """Test batch analysis with a fixed analyzer class across processes"""
+    import git_doc_hook.analyzers as analyzers
+    from git_doc_hook.analyzers import _cache
+
+    monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(analyzers, "_PARALLEL_MIN_FILES", 1)
+
+    paths = []
+    for i in range(3):
+        script = tmp_path / f"tool{i}"  # No extension: dispatch would not pick Bash
+        script.write_text("".join(f"f{j}() {{\n}}\n" for j in range(i)))
+        paths.append(str(script))
+
+    results = analyzers.analyze_many(analyzers.BashAnalyzer, paths, workers=2)
+
+    assert [r.language for r in results] == ["Bash"] * 3
+    assert [len(r.functions) for r in results] == [0, 1, 2]
@@ -80,6 +80,23 @@ def test_init_creates_hooks(temp_git_project, runner):
     assert (hooks_dir / "post-commit").exists()
 
 
+def test_init_force_makes_hooks_executable(temp_git_project, runner):
+    """Test that replaced hooks are executable and run the hook commands"""
+    hooks_dir = temp_git_project / ".git" / "hooks"
+    hooks_dir.mkdir(exist_ok=True)
+    (hooks_dir / "pre-push").write_text("old")
+    (hooks_dir / "pre-push").chmod(0o644)
+
+    result = runner.invoke(cli, ["init", "--force", "--project", str(temp_git_project)])
+
+    assert result.exit_code == 0
+    for name, command in (("pre-push", 'check-pre-push "$@"'), ("post-commit", "check-post-commit")):
+        hook = hooks_dir / name
+        assert hook.stat().st_mode & 0o777 == 0o755
+        assert hook.read_text().startswith("#!/bin/bash\n")
+        assert command in hook.read_text()
+
+
 def test_init_force(temp_git_project, runner):
     """Test init with --force flag"""
     # First init
@@ -102,6 +119,17 @@ def test_init_non_git_repo(tmp_path, runner):
     assert "Not a Git repository" in result.output
 
 
+def test_project_must_be_directory(tmp_path, runner):
+    """Test that --project is rejected unless it is an existing directory"""
+    (tmp_path / "file.txt").write_text("")
+
+    for project in (tmp_path / "missing", tmp_path / "file.txt"):
+        result = runner.invoke(cli, ["status", "--project", str(project)])
+
+        assert result.exit_code == 2
+        assert "--project" in result.output
+
+
 def test_status_command_empty(temp_git_project, runner):
     """Test status command with no pending updates"""
     # Initialize first
@@ -148,6 +176,27 @@ def test_memos_sync_command_no_records(temp_git_project, runner):
     assert "No MemOS records" in result.output
 
 
+def test_memos_sync_command_lists_records(temp_git_project, runner):
+    """Test memos-sync command listing pending records in order"""
+    from git_doc_hook.core.state import StateManager
+
+    runner.invoke(cli, ["init", "--project", str(temp_git_project)])
+    state = StateManager(str(temp_git_project))
+    state.set_pending(
+        layers={"memo"}, reason="Test", triggered_by="abc123", files=[], commit_message=""
+    )
+    state.add_memos_record({"record_type": "troubleshooting", "commit_message": "fix: crash"})
+    state.add_memos_record({"record_type": "adr", "commit_message": "decision: db"})
+
+    result = runner.invoke(cli, ["memos-sync", "--project", str(temp_git_project)])
+
+    assert result.exit_code == 0
+    assert "MemOS records pending sync: 2" in result.output
+    assert result.output.index("1. [troubleshooting] fix: crash") < result.output.index(
+        "2. [adr] decision: db"
+    )
+
+
 def test_check_memos_command(temp_git_project, runner):
     """Test check-memos hidden command"""
     result = runner.invoke(cli, ["init", "--project", str(temp_git_project)])
@@ -192,6 +241,67 @@ def test_help_command(runner):
     assert "memos-sync" in result.output
 
 
+def test_cli_import_defers_core_modules():
+    """Test that importing the CLI does not load core modules or YAML"""
+    import subprocess
+
+    code = (
+        "import sys; import git_doc_hook.cli; "
+        "print(','.join(m for m in sys.modules if m.startswith('git_doc_hook.'))); "
+        "print('yaml' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={"PYTHONPATH": str(Path(__file__).parent.parent / "src")},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ["git_doc_hook.cli", "False"]
+
+
+def test_core_config_import_defers_other_core_modules():
+    """Test that loading the config module does not load git or state"""
+    import subprocess
+
+    code = (
+        "import sys; from git_doc_hook.core.config import Config; "
+        "from git_doc_hook.core import config, glob_match; "
+        "print('git_doc_hook.core.git' in sys.modules, 'git_doc_hook.core.state' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={"PYTHONPATH": str(Path(__file__).parent.parent / "src")},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_package_forwards_core_classes():
+    """Test that the package exposes core classes lazily via git_doc_hook.core"""
+    import subprocess
+
+    code = (
+        "import sys, git_doc_hook; from git_doc_hook import core; "
+        "print('git_doc_hook.core.state' in sys.modules); "
+        "print(git_doc_hook.Config is core.Config, git_doc_hook.StateManager is core.StateManager); "
+        "print(hasattr(git_doc_hook, 'glob_match'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={"PYTHONPATH": str(Path(__file__).parent.parent / "src")},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ["False", "True", "True", "False"]
+
+
 def test_update_command_no_pending(temp_git_project, runner):
     """Test update command with no pending updates"""
     # Initialize first
@@ -203,6 +313,86 @@ def test_update_command_no_pending(temp_git_project, runner):
     assert "No pending" in result.output
 
 
+def test_update_command_layers(temp_git_project, runner):
+    """Test update command layer validation and completion"""
+    from git_doc_hook.core.state import StateManager
+
+    runner.invoke(cli, ["init", "--project", str(temp_git_project)])
+    state = StateManager(str(temp_git_project))
+    state.set_pending(
+        layers=["memo", "custom"],
+        reason="Test",
+        triggered_by="abc123",
+        files=["app.py"],
+        commit_message="fix: crash",
+    )
+    assert state.get_pending().layers == frozenset(("memo", "custom"))
+
+    for requested in ("memo,bogus", "custom"):
+        result = runner.invoke(cli, ["update", requested, "--project", str(temp_git_project)])
+        assert result.exit_code == 1
+        assert "Invalid layers: " + requested.split(",")[-1] in result.output
+
+    result = runner.invoke(cli, ["update", " memo ", "--project", str(temp_git_project)])
+    assert result.exit_code == 0
+    assert "Remaining: custom" in result.output
+    assert state.get_pending_layers() == {"custom"}
+
+
+def test_update_command_layer_order(temp_git_project, runner):
+    """Test that layers are processed in a fixed order, memo last"""
+    from git_doc_hook.core.state import StateManager
+
+    runner.invoke(cli, ["init", "--project", str(temp_git_project)])
+    StateManager(str(temp_git_project)).set_pending(
+        layers={"memo", "traditional", "config"},
+        reason="Test",
+        triggered_by="abc123",
+        files=["app.py"],
+        commit_message="fix: crash",
+    )
+
+    result = runner.invoke(
+        cli, ["update", "memo,config,traditional", "--project", str(temp_git_project)]
+    )
+
+    assert "Updating layers: traditional, config, memo" in result.output
+
+
+def test_check_pre_push_memo_keywords(temp_git_project, monkeypatch, tmp_path):
+    """Test that pre-push stops scanning commit messages at the first keyword hit"""
+    from datetime import datetime
+    from git_doc_hook.cli import _check_pre_push
+    from git_doc_hook.core.git import Commit, DiffResult, GitManager
+    from git_doc_hook.core.state import StateManager
+
+    class UnscannedCommit(Commit):
+        @property
+        def message_lower(self):
+            raise AssertionError("scanned after a keyword match")
+
+    def commit(cls, message):
+        return cls("abc123", message, "Test User", datetime.now(), [])
+
+    diff = DiffResult(
+        commits=[
+            commit(Commit, "chore: bump deps"),
+            commit(Commit, "数据库选型 for storage"),
+            commit(UnscannedCommit, "fix: crash"),
+        ],
+        files=set(),
+        file_changes=[],
+    )
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(temp_git_project)
+    monkeypatch.setattr(GitManager, "get_diff", lambda self, target_ref: diff)
+
+    with pytest.raises(SystemExit):
+        _check_pre_push()
+
+    assert StateManager(".").get_pending_layers() == {"memo"}
+
+
 def test_check_pre_push_hidden(temp_git_project, runner):
     """Test check-pre-push hidden command"""
     # Run from within the git project directory
@@ -240,3 +430,195 @@ def test_init_custom_project_name(temp_git_project, runner):
     # Check config was created
     config_file = temp_git_project / ".git-doc-hook.yml"
     assert config_file.exists()
+
+
+def test_main_runs_hook_commands_without_click(tmp_path, monkeypatch, capsys):
+    """Test that main() dispatches hook commands directly"""
+    import git_doc_hook.cli as cli_module
+
+    def fail():
+        raise AssertionError("cli() should not be called")
+
+    monkeypatch.setattr(cli_module, "cli", fail)
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setattr(sys, "argv", ["git-doc-hook", "check-post-commit"])
+    cli_module.main()
+    monkeypatch.setattr(sys, "argv", ["git-doc-hook", "check-pre-push", "origin", "url"])
+    cli_module.main()
+
+    assert capsys.readouterr().out == ""
+
+
+def test_main_falls_back_to_click_for_options(monkeypatch):
+    """Test that main() leaves hook commands with options to Click"""
+    import git_doc_hook.cli as cli_module
+
+    calls = []
+    monkeypatch.setattr(cli_module, "cli", lambda: calls.append(True))
+
+    monkeypatch.setattr(sys, "argv", ["git-doc-hook", "check-post-commit", "--help"])
+    cli_module.main()
+    monkeypatch.setattr(sys, "argv", ["git-doc-hook", "status"])
+    cli_module.main()
+
+    assert calls == [True, True]
+
+
+def test_get_file_type():
+    """Test file type detection from the parent directory name"""
+    from git_doc_hook.cli import _get_file_type
+
+    assert _get_file_type("app/Service/auth.py") == "Service"
+    assert _get_file_type("helper/strings.py") == "Utility"
+    assert _get_file_type("main.py") == "Module"
+
+
+def test_get_default_headers():
+    """Test default table headers per section"""
+    from git_doc_hook.cli import _get_default_headers
+
+    assert _get_default_headers("Modules") == ("File", "Path", "Description")
+    assert _get_default_headers("Services") == ("Name", "Path", "Type")
+    assert _get_default_headers("Unknown") == ("Name", "Path", "Type")
+
+
+def test_extract_value():
+    """Test placeholder substitution in row values"""
+    from git_doc_hook.cli import _extract_value, _file_values
+
+    values = _file_values("service/auth.py")
+
+    assert _extract_value(values, {}, "{file}") == "auth.py"
+    assert _extract_value(values, {}, "{file} ({type})") == "auth.py (Service)"
+    assert _extract_value(values, {}, "[{path}]") == "[service/auth.py]"
+    assert _extract_value(values, {}, "{name}") == "{name}"
+    assert _extract_value(values, {}, "static") == "static"
+
+
+def test_post_commit_keywords():
+    """Test post-commit keyword matching is a case-insensitive substring match"""
+    from git_doc_hook.cli import _POST_COMMIT_RE
+
+    assert _POST_COMMIT_RE.search("Fixed the crash")
+    assert _POST_COMMIT_RE.search("BUGFIX: parser")
+    assert _POST_COMMIT_RE.search("Architecture decisions")
+    assert not _POST_COMMIT_RE.search("docs: update README")
+
+
+def test_resolve_project(tmp_path, monkeypatch):
+    """Test project path normalization"""
+    from git_doc_hook.cli import _resolve_project
+
+    target = tmp_path / "target"
+    target.mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(target)
+    monkeypatch.chdir(link)
+
+    assert _resolve_project(".") == Path(".").resolve()
+    assert _resolve_project(str(link) + "/./") == link
+    assert _resolve_project("sub") == target / "sub"
+    assert _resolve_project(str(link / "..")) == tmp_path
+
+
+def test_update_traditional_docs_actions(temp_git_project, monkeypatch):
+    """Test that traditional docs actions are dispatched per matched rule"""
+    import git_doc_hook.template
+    import git_doc_hook.updaters
+    from git_doc_hook.cli import _update_traditional_docs
+    from git_doc_hook.core.config import Config
+    from git_doc_hook.core.state import StateManager
+
+    # The helper imports these modules by their short names
+    monkeypatch.setitem(sys.modules, "template", git_doc_hook.template)
+    monkeypatch.setitem(sys.modules, "updaters", git_doc_hook.updaters)
+
+    config = Config(str(temp_git_project))
+    config.save({
+        "updaters": {"backup": False},
+        "rules": [
+            {
+                "pattern": "services/*.py",
+                "layers": ["traditional"],
+                "actions": [
+                    {"target": "SERVICES.md", "section": "Services", "action": "append_table_row"},
+                    {"target": "SERVICES.md", "action": "unknown_action"},
+                ],
+            },
+            {
+                "pattern": "**/*.py",
+                "layers": ["memo"],
+                "actions": [{"target": "MEMO.md", "action": "append_record"}],
+            },
+        ],
+    })
+    state = StateManager(str(temp_git_project), config)
+    state.set_pending(
+        layers={"traditional"},
+        reason="Test",
+        triggered_by="abc123",
+        files=["services/auth.py", "main.py"],
+        commit_message="feat: auth",
+    )
+
+    assert _update_traditional_docs(temp_git_project, config, state.get_pending()) is True
+    assert "| services/auth.py | Module |" in (temp_git_project / "SERVICES.md").read_text()
+    assert not (temp_git_project / "MEMO.md").exists()
+
+
+def test_git_commit_staging(temp_git_project):
+    """Test that untracked files are only committed when staging them"""
+    import subprocess
+    from git_doc_hook.cli import _git_commit
+
+    def committed_files():
+        result = subprocess.run(
+            ["git", "show", "--name-only", "--format=", "HEAD"],
+            cwd=temp_git_project, capture_output=True, text=True, check=True,
+        )
+        return result.stdout.split()
+
+    (temp_git_project / "README.md").write_text("# Project\n")
+    subprocess.run(["git", "add", "README.md"], cwd=temp_git_project, check=True)
+    subprocess.run(["git", "commit", "-qm", "init"], cwd=temp_git_project, check=True)
+
+    (temp_git_project / "README.md").write_text("# Changed\n")
+    (temp_git_project / "NEW.md").write_text("new\n")
+
+    assert _git_commit(temp_git_project, "docs: tracked", stage_untracked=False)
+    assert committed_files() == ["README.md"]
+
+    assert _git_commit(temp_git_project, "docs: all")
+    assert committed_files() == ["NEW.md"]
+
+    assert not _git_commit(temp_git_project, "docs: nothing")
+
+
+def test_update_commit_excludes_config_cache(temp_git_project, runner, monkeypatch, tmp_path):
+    """Test that update --commit does not commit the parsed config cache"""
+    import subprocess
+    from git_doc_hook.core import config as config_module
+    from git_doc_hook.core.state import StateManager
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    runner.invoke(cli, ["init", "--project", str(temp_git_project)])
+    StateManager(str(temp_git_project)).set_pending(
+        layers=["memo"],
+        reason="Test",
+        triggered_by="abc123",
+        files=["app.py"],
+        commit_message="fix: crash",
+    )
+    (temp_git_project / "app.py").write_text("print('hi')\n")
+    config_module._PARSED_CONFIGS.clear()
+
+    result = runner.invoke(cli, ["update", "memo", "--commit", "--project", str(temp_git_project)])
+    assert "Committed" in result.output
+
+    committed = subprocess.run(
+        ["git", "ls-files"], cwd=temp_git_project, capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert "app.py" in committed
+    assert not [name for name in committed if name.endswith(".cache.json")]
+    assert list((tmp_path / "home" / ".git-doc-hook" / temp_git_project.name).glob("config.*.cache.json"))
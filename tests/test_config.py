@@ -1,6 +1,8 @@
 """Tests for configuration management"""
+import os
 import pytest
 from pathlib import Path
+from git_doc_hook.core import config as config_module
 from git_doc_hook.core.config import Config, glob_match
 
 
@@ -114,6 +116,22 @@ def test_keywords_property(temp_project):
     assert isinstance(keywords["troubleshooting"], list)
 
 
+def test_keyword_pattern(temp_project):
+    """Test combined keyword pattern for several categories"""
+    config = Config(str(temp_project))
+    config.save({"keywords": {"troubleshooting": ["fix", "a.b"], "decisions": ["选型"]}})
+
+    pattern = config.keyword_pattern("troubleshooting", "decisions")
+
+    assert pattern.search("bugfix for parser")
+    assert pattern.search("数据库选型")
+    assert pattern.search("a.b")
+    assert not pattern.search("axb")
+    assert config.keyword_pattern("troubleshooting", "decisions") is pattern
+    assert config.keyword_pattern("missing") is None
+    assert config.keyword_pattern("troubleshooting", "troubleshooting").pattern == r"fix|a\.b"
+
+
 def test_get_method(temp_project):
     """Test get method with dot notation"""
     config = Config(str(temp_project))
@@ -125,6 +143,20 @@ def test_get_method(temp_project):
     assert config.get("nonexistent.key", "default") == "default"
 
 
+def test_get_method_after_save(temp_project):
+    """Test get on whole sections, dotted keys and a saved config"""
+    config = Config(str(temp_project))
+
+    assert config.get("layers")["memo"] is config.get("layers.memo")
+    assert config.get("layers.memo.missing", 1) == 1
+
+    config.save({"state": {"dir": "/tmp/state"}, "odd.key": 1, "memos": {"enabled": True}})
+
+    assert config.get("memos.enabled") is True
+    assert config.get("odd.key") is None
+    assert config.get("state.dir") == "/tmp/state"
+
+
 def test_get_rules_for_pattern(temp_project):
     """Test pattern matching in rules"""
     config = Config(str(temp_project))
@@ -134,6 +166,48 @@ def test_get_rules_for_pattern(temp_project):
     assert len(matches) > 0
 
 
+def test_get_rules_for_pattern_after_save(temp_project):
+    """Test that saving a new configuration refreshes compiled rules"""
+    config = Config(str(temp_project))
+    assert len(config.get_rules_for_pattern("services/auth.py")) == 2
+
+    # Returned lists are copies of the memoized result
+    config.get_rules_for_pattern("services/auth.py").clear()
+    assert len(config.get_rules_for_pattern("services/auth.py")) == 2
+
+    config.save({"rules": [{"pattern": "lib/*.py", "layers": []}]})
+    assert config.get_rules_for_pattern("services/auth.py") == []
+    assert len(config.get_rules_for_pattern("lib/util.py")) == 1
+
+
+def test_get_rule_indices(temp_project):
+    """Test rule indices and the rules digest they are valid for"""
+    config = Config(str(temp_project))
+    digest = config.rules_digest
+
+    assert config.get_rule_indices("services/auth.py") == [0, 1]
+    assert config.get_rule_indices("main.py") == [1]
+    assert config.rules_digest == digest
+
+    config.save({"rules": [{"pattern": "lib/*.py", "layers": []}]})
+    assert config.get_rule_indices("lib/util.py") == [0]
+    assert config.rules_digest != digest
+
+
+def test_get_rule_indices_many_rules(temp_project):
+    """Test that every matching rule is found, in rule order"""
+    config = Config(str(temp_project))
+    patterns = ["docs/*.md", "src/**/*.py", "*.py", "src/a.py", "**/a.py", "src/?.py"]
+    config.save({"rules": [{"pattern": p} for p in patterns]})
+
+    assert config.get_rule_indices("src/a.py") == [1, 3, 4, 5]
+    assert config.get_rule_indices("a.py") == [2, 4]
+    assert config.get_rule_indices("lib/b.js") == []
+
+    config.save({"rules": []})
+    assert config.get_rule_indices("src/a.py") == []
+
+
 class TestGlobMatch:
     """Test glob pattern matching with ** support."""
 
@@ -266,3 +340,171 @@ keywords:
 
     # Should preserve other keyword categories
     assert "decisions" in loaded["keywords"]
+
+
+def test_load_does_not_share_defaults(temp_project):
+    """Test that changing a loaded config leaves the defaults untouched"""
+    (temp_project / ".git-doc-hook.yml").write_text("keywords:\n  troubleshooting: [fix]\n")
+
+    loaded = Config(str(temp_project)).load()
+    loaded["keywords"]["decisions"].append("changed")
+    loaded["layers"]["traditional"]["docs"].clear()
+
+    assert "changed" not in Config.DEFAULT_CONFIG["keywords"]["decisions"]
+    assert Config(str(temp_project)).load()["layers"]["traditional"]["docs"]
+
+
+@pytest.fixture
+def state_dir(sample_config, tmp_path, monkeypatch):
+    """Create the project's per-user state directory under a temporary home"""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    path = tmp_path / "home" / ".git-doc-hook" / sample_config.name
+    path.mkdir(parents=True)
+    return path
+
+
+def test_config_cache_written_and_reused(sample_config, state_dir):
+    """Test that parsed YAML is cached as JSON and reused"""
+    import json
+
+    Config(str(sample_config)).load()
+    (cache_file,) = state_dir.glob("config.*.cache.json")
+    cached = json.loads(cache_file.read_text())
+    assert "custom" in cached["config"]["layers"]
+    assert not (sample_config / ".git-doc-hook").exists()
+
+    # A cache entry matching the YAML file's stamp is used without parsing
+    cached["config"]["layers"]["cached"] = {"name": "Cached", "docs": []}
+    cache_file.write_text(json.dumps(cached))
+    config_module._PARSED_CONFIGS.clear()
+    assert "cached" in Config(str(sample_config)).layers
+
+
+def test_config_reused_within_process(sample_config, monkeypatch):
+    """Test that a config file is parsed once per process"""
+    import yaml
+
+    first = Config(str(sample_config)).load()
+    first["layers"]["custom"]["name"] = "Modified"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("config file parsed again")
+
+    monkeypatch.setattr(yaml, "load", fail)
+    second = Config(str(sample_config)).load()
+
+    # Each Config gets its own copy
+    assert second["layers"]["custom"]["name"] == "Custom Layer"
+
+
+def test_config_cache_per_checkout(tmp_path, monkeypatch):
+    """Test that checkouts with the same directory name keep separate caches"""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home" / ".git-doc-hook" / "app").mkdir(parents=True)
+    checkouts = [tmp_path / "a" / "app", tmp_path / "b" / "app"]
+    for i, checkout in enumerate(checkouts):
+        checkout.mkdir(parents=True)
+        (checkout / ".git-doc-hook.yml").write_text(f"state:\n  project_key: key{i}\n")
+        Config(str(checkout)).load()
+
+    cache_files = list((tmp_path / "home" / ".git-doc-hook" / "app").glob("config.*.cache.json"))
+    assert len(cache_files) == 2
+
+    # Both are served from their own cache file without parsing
+    import yaml
+
+    def fail(*args, **kwargs):
+        raise AssertionError("config file parsed again")
+
+    config_module._PARSED_CONFIGS.clear()
+    monkeypatch.setattr(yaml, "load", fail)
+    assert [Config(str(c)).get("state.project_key") for c in checkouts] == ["key0", "key1"]
+
+
+def test_config_cache_invalidated_by_change(sample_config, state_dir):
+    """Test that editing the YAML file bypasses a stale cache"""
+    Config(str(sample_config)).load()
+
+    config_file = sample_config / ".git-doc-hook.yml"
+    config_file.write_text(config_file.read_text() + "\nmemos:\n  enabled: true\n")
+
+    assert Config(str(sample_config)).memos_enabled is True
+
+
+def test_config_cache_invalidated_by_replacement(sample_config):
+    """Test that a file renamed over the YAML file is parsed even with the same size and mtime"""
+    config_file = sample_config / ".git-doc-hook.yml"
+    config_file.write_text("memos:\n  enabled: false\n")
+    Config(str(sample_config)).load()
+
+    st = config_file.stat()
+    replacement = sample_config / "replacement.yml"
+    replacement.write_text("memos:\n  enabled: true \n")
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, config_file)
+
+    assert Config(str(sample_config)).memos_enabled is True
+
+
+def test_save_replaces_file_atomically(temp_project):
+    """Test that save keeps the file mode and leaves no temporary file"""
+    config_file = temp_project / ".git-doc-hook.yml"
+    config_file.write_text("memos:\n  enabled: false\n")
+    config_file.chmod(0o600)
+
+    config = Config(str(temp_project))
+    config.load()["memos"]["enabled"] = True
+    config.save()
+
+    assert config_file.stat().st_mode & 0o777 == 0o600
+    assert sorted(p.name for p in temp_project.iterdir()) == [".git-doc-hook.yml"]
+    assert Config(str(temp_project)).memos_enabled is True
+
+
+def test_get_sees_changes_to_loaded_config(temp_project):
+    """Test that values derived by get() and friends follow edits to load()'s dict"""
+    config = Config(str(temp_project))
+    assert config.get("memos.enabled") is False
+    assert config.keyword_pattern("troubleshooting").search("zzz") is None
+    assert config.get_rule_indices("zzz/app.qq") == []
+
+    loaded = config.load()
+    loaded["memos"]["enabled"] = True
+    loaded["keywords"]["troubleshooting"] = ["zzz"]
+    loaded["rules"] = [{"pattern": "zzz/*.qq", "layers": ["memo"]}]
+
+    assert config.get("memos.enabled") is True
+    assert config.memos_enabled is True
+    assert config.keyword_pattern("troubleshooting").search("zzz")
+    assert config.get_rule_indices("zzz/app.qq") == [0]
+
+
+def test_save_without_load_keeps_file_mode(temp_project):
+    """Test that saving from a fresh Config keeps the existing file's mode"""
+    config_file = temp_project / ".git-doc-hook.yml"
+    config_file.write_text("memos:\n  enabled: false\n")
+    config_file.chmod(0o600)
+
+    Config(str(temp_project)).save({"memos": {"enabled": True}})
+
+    assert config_file.stat().st_mode & 0o777 == 0o600
+    assert Config(str(temp_project)).memos_enabled is True
+
+
+def test_config_exists(temp_project):
+    """Test config_exists before and after saving"""
+    config = Config(str(temp_project))
+    assert config.config_exists is False
+
+    config.save()
+    assert config.config_exists is True
+    assert Config(str(temp_project)).config_exists is True
+
+
+def test_config_cache_requires_state_directory(sample_config, tmp_path, monkeypatch):
+    """Test that no cache file is created in an uninitialized project"""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    Config(str(sample_config)).load()
+
+    assert not (tmp_path / "home").exists()
+    assert not (sample_config / ".git-doc-hook").exists()
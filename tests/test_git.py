@@ -87,6 +87,8 @@ def test_commit_dataclass():
     assert commit.short_hash == "abc123"
     assert commit.contains_keywords(["test"])
     assert not commit.contains_keywords(["fix"])
+    assert commit.message_lower == "test commit"
+    assert commit.message_lower is commit.message_lower
 
 
 def test_commit_type_extraction():
@@ -211,6 +213,27 @@ def test_get_head_commit(git_repo, git_manager):
     assert commit.message == "initial"
 
 
+def test_commit_message_with_separator(git_repo, git_manager):
+    """Test that commit subjects containing "|" are read in full"""
+    import subprocess
+
+    (git_repo / "test.txt").write_text("test")
+    subprocess.run(["git", "add", "."], cwd=git_repo, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "chore | fix crash | part 3"],
+        cwd=git_repo,
+        capture_output=True,
+    )
+
+    head = git_manager.get_head_commit()
+    assert head.message == "chore | fix crash | part 3"
+    assert head.author == "Test User"
+
+    recent = git_manager.get_commits(limit=1)
+    assert [c.message for c in recent] == [head.message]
+    assert recent[0].files == ["test.txt"]
+
+
 def test_get_staged_files(git_repo, git_manager):
     """Test getting staged files"""
     (git_repo / "staged.txt").write_text("staged")
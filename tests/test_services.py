@@ -0,0 +1,16 @@
+"""Tests for the example services"""
+from services.user_service import UserService
+
+
+def test_user_service_create_and_get():
+    """Test users are looked up by username, first registration winning"""
+    service = UserService()
+    alice = service.create_user("alice", "alice@example.com")
+    service.create_user("bob", "bob@example.com")
+    duplicate = service.create_user("alice", "other@example.com")
+
+    assert service.get_user("alice") is alice
+    assert duplicate == {"username": "alice", "email": "other@example.com"}
+    assert service.get_user("bob")["email"] == "bob@example.com"
+    assert service.get_user("carol") is None
+    assert list(service.users.values()) == [alice, service.get_user("bob")]
@@ -1,5 +1,6 @@
 """Tests for state management"""
 import json
+import math
 import time
 import pytest
 from pathlib import Path
@@ -51,6 +52,23 @@ def test_set_pending(state_manager):
     assert state_manager.is_pending()
 
 
+def test_set_pending_matched_rules(state_manager):
+    """Test that matched rule indices are stored with the pending update"""
+    state_manager.set_pending(
+        layers={"traditional"},
+        reason="Test",
+        triggered_by="abc123",
+        files=["services/auth.py", "README.md"],
+        commit_message="feat: auth",
+        matched_rules={"services/auth.py": [0, 1]},
+        rules_digest="digest",
+    )
+
+    pending = state_manager.get_pending()
+    assert pending.matched_rules == {"services/auth.py": [0, 1]}
+    assert pending.rules_digest == "digest"
+
+
 def test_get_pending(state_manager):
     """Test getting pending state"""
     layers = {"traditional"}
@@ -269,9 +287,14 @@ def test_history_limit(state_manager):
         )
         state_manager.clear_pending()
 
+    state_manager.add_to_history({"memo"}, "synced")
+
     history = state_manager.get_history(limit=200)
 
-    assert len(history) <= 100
+    assert len(history) == 100
+    assert history[0]["action"] == "synced"
+    assert [entry["reason"] for entry in history[1:3]] == ["Update 149", "Update 148"]
+    assert history[-1]["reason"] == "Update 51"
 
 
 def test_empty_state_file(state_manager, temp_project):
@@ -316,7 +339,7 @@ def test_add_memos_record(state_manager):
         "timestamp": time.time(),
         "cube_id": "test-cube",
     }
-    state_manager.add_memos_record(record)
+    assert state_manager.add_memos_record(record) == 1
 
     # Verify it was added
     records = state_manager.get_pending_memos_records()
@@ -332,6 +355,12 @@ def test_get_pending_memos_records_empty(temp_project):
     assert records == []
 
 
+def test_add_memos_record_without_pending(state_manager):
+    """Test that a MemOS record is not added without a pending update"""
+    assert state_manager.add_memos_record({"record_type": "general"}) == 0
+    assert state_manager.get_pending_memos_records() == []
+
+
 def test_get_pending_memos_records(state_manager):
     """Test getting pending MemOS records"""
     # Set up pending state
@@ -525,3 +554,191 @@ def test_pending_update_with_memos_records_backward_compat():
     pending = PendingUpdate.from_dict(new_data)
     assert len(pending.memos_records) == 1
     assert pending.memos_records[0]["record_type"] == "general"
+
+
+def test_write_pending_json(state_manager):
+    """Test streaming the pending update as JSON"""
+    import io
+
+    out = io.StringIO()
+    state_manager.write_pending_json(out)
+    assert json.loads(out.getvalue()) == {"has_pending": False, "pending": None}
+
+    state_manager.set_pending(
+        layers={"memo"},
+        reason="Test",
+        triggered_by="abc123",
+        files=["a.py", "b.py"],
+        commit_message="fix: bug",
+    )
+    out = io.StringIO()
+    state_manager.write_pending_json(out)
+
+    pending = state_manager.get_pending()
+    expected = {"has_pending": True, "pending": pending.to_dict()}
+    assert out.getvalue() == json.dumps(expected, indent=2) + "\n"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_output_matches_stdlib(monkeypatch, use_orjson):
+    """Test that JSON output is the same with or without orjson"""
+    from git_doc_hook.core import _json
+
+    if not use_orjson:
+        monkeypatch.setattr(_json, "orjson", None)
+
+    data = {
+        "layers": ["memo"],
+        "files": [],
+        "commit_message": "数据库选型: \"quoted\"",
+        "nested": {"timestamp": 1700000000.25, "synced": None, 1: True},
+    }
+
+    assert _json.dumps(data) == json.dumps(data, indent=2)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_file_round_trip(monkeypatch, use_orjson):
+    """Test that state documents decode to what was encoded, with or without orjson"""
+    from git_doc_hook.core import _json
+
+    if not use_orjson:
+        monkeypatch.setattr(_json, "orjson", None)
+
+    data = {"pending": {"commit_message": "数据库选型", "timestamp": 1700000000.25}, "history": []}
+
+    assert _json.loads(_json.encode(data)) == data
+    assert _json.loads(_json.encode({1: True})) == {"1": True}
+    assert math.isnan(_json.loads(b'{"x": NaN}')["x"])
+    with pytest.raises(ValueError):
+        _json.loads(b"{not json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_non_finite_floats(monkeypatch, use_orjson):
+    """Test that NaN and Infinity survive encoding, with or without orjson"""
+    from git_doc_hook.core import _json
+
+    if not use_orjson:
+        monkeypatch.setattr(_json, "orjson", None)
+
+    data = {"pending": None, "stats": [1.5, {"ratio": float("inf")}], "score": float("nan")}
+
+    assert _json.dumps(data) == json.dumps(data, indent=2)
+    decoded = _json.loads(_json.encode(data))
+    assert decoded["stats"] == [1.5, {"ratio": float("inf")}]
+    assert math.isnan(decoded["score"])
+    assert decoded["pending"] is None
+
+
+@pytest.fixture
+def state_parses(monkeypatch):
+    """Record each state document the state module parses"""
+    from git_doc_hook.core import state as state_module
+
+    parses = []
+
+    def loads(data):
+        parses.append(data)
+        return json.loads(data)
+
+    monkeypatch.setattr(state_module, "loads", loads)
+    return parses
+
+
+def test_state_file_parsed_once_until_changed(state_manager, temp_project, state_parses):
+    """Test that the state file is only parsed again after it changes"""
+    state_manager.set_pending(
+        layers={"memo"}, reason="Test", triggered_by="abc123", files=["a.py"], commit_message=""
+    )
+
+    # The state just saved is reused without reading the file
+    assert state_manager.is_pending()
+    assert state_manager.get_pending_layers() == {"memo"}
+    state_manager.get_pending().files.append("changed.py")
+    assert state_manager.get_pending().files == ["a.py"]
+    assert state_parses == []
+
+    # A change by another StateManager is picked up
+    StateManager(str(temp_project)).clear_pending()
+    assert not state_manager.is_pending()
+    assert state_manager.get_history()[0]["files"] == ["a.py"]
+    assert len(state_parses) == 2
+
+
+def test_state_mutations_reuse_saved_state(state_manager, temp_project, state_parses):
+    """Test that consecutive changes do not read back the state they saved"""
+    state_manager.set_pending(
+        layers={"memo"}, reason="Test", triggered_by="abc123", files=[], commit_message=""
+    )
+    assert state_manager.add_memos_record({"record_type": "adr"}) == 1
+    assert state_manager.mark_memos_record_synced(0)
+    state_manager.add_to_history({"memo"}, "synced")
+    state_manager.clear_pending()
+
+    assert state_parses == []
+
+    state = StateManager(str(temp_project))
+    assert [entry.get("action") for entry in state.get_history()] == [None, "synced"]
+    assert state.get_history()[0]["memos_records"] == [{"record_type": "adr", "synced": True}]
+
+
+def test_list_all_projects(tmp_path, state_parses):
+    """Test listing projects, skipping those without a pending update unparsed"""
+    pending = {"layers": ["memo"], "reason": "Test"}
+    (tmp_path / "with-pending").mkdir()
+    (tmp_path / "with-pending" / "pending.json").write_text(
+        json.dumps({"pending": pending, "history": []}, indent=2)
+    )
+    (tmp_path / "done").mkdir()
+    (tmp_path / "done" / "pending.json").write_text(
+        json.dumps({"pending": None, "history": [pending] * 100}, indent=2)
+    )
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "pending.json").write_text("{")
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "file.json").write_text("{}")
+
+    projects = StateManager.list_all_projects(tmp_path)
+
+    assert projects == [{
+        "name": "with-pending",
+        "path": str(tmp_path / "with-pending"),
+        "pending": pending,
+    }]
+    assert len(state_parses) == 2
+    assert StateManager.list_all_projects(tmp_path / "missing") == []
+
+
+def test_cleared_state_file_recognized_without_parsing(state_manager):
+    """Test that saved state without a pending update starts as list_all_projects expects"""
+    from git_doc_hook.core.state import _NO_PENDING_PREFIX
+
+    state_manager.set_pending(
+        layers={"memo"}, reason="Test", triggered_by="abc123", files=[], commit_message=""
+    )
+    state_manager.clear_pending()
+
+    assert state_manager.state_file.read_bytes().startswith(_NO_PENDING_PREFIX)
+
+
+def test_save_state_is_atomic(state_manager, monkeypatch):
+    """Test that a failed save leaves the previous state file and no temporary file"""
+    from git_doc_hook.core import state as state_module
+
+    state_manager.set_pending(
+        layers={"memo"}, reason="Test", triggered_by="abc123", files=[], commit_message=""
+    )
+    saved = state_manager.state_file.read_bytes()
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(state_module.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        state_manager.clear_pending()
+    monkeypatch.undo()
+
+    assert state_manager.state_file.read_bytes() == saved
+    assert [p.name for p in state_manager.state_dir.iterdir()] == ["pending.json"]
+    assert state_manager.is_pending()